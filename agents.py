@@ -1,26 +1,110 @@
 from browser_use import Agent, Browser, ChatGoogle
 from dotenv import load_dotenv
+from automation_utils import freeze, json_default, thaw, write_json_report
+import httpx
+from cachetools import TTLCache
+import orjson
+import zstandard
 import asyncio
+import atexit
+import base64
+import concurrent.futures
+import functools
+import hashlib
+import inspect
+import io
 import json
+import queue
+import re
+import threading
 import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Awaitable, Callable, Tuple, Union
+from dataclasses import dataclass, field
 from pathlib import Path
 import logging
+import logging.handlers
 from enum import Enum
 
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('automation.log'),
-        logging.StreamHandler()
-    ]
-)
+class BufferedFileHandler(logging.StreamHandler):
+    """Append-only file handler that batches records into one write per flush.
+    
+    The buffer is flushed every ``flush_every`` records, or by a background
+    thread ``flush_interval`` seconds after the first unflushed record,
+    whichever comes first. The thread sleeps while nothing is buffered.
+    """
+    
+    def __init__(self, filename: str, buffer_size: int = 65536,
+                 flush_every: int = 256, flush_interval: float = 0.01):
+        raw = open(filename, 'ab', buffering=0)
+        super().__init__(io.TextIOWrapper(io.BufferedWriter(raw, buffer_size=buffer_size), encoding='utf-8'))
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._pending = 0
+        self._dirty = threading.Event()
+        threading.Thread(target=self._flush_loop, name='log-flush', daemon=True).start()
+    
+    def _flush_pending(self):
+        """Flush buffered records; the caller holds the handler lock."""
+        if self._pending:
+            self.stream.flush()
+            self._pending = 0
+        self._dirty.clear()
+    
+    def _flush_loop(self):
+        while True:
+            self._dirty.wait()
+            time.sleep(self.flush_interval)
+            self.acquire()
+            try:
+                if self.stream.closed:
+                    return
+                self._flush_pending()
+            finally:
+                self.release()
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            self._pending += 1
+            
+            if self._pending >= self.flush_every:
+                self._flush_pending()
+            else:
+                self._dirty.set()
+        except Exception:
+            self.handleError(record)
+    
+    def close(self):
+        self.acquire()
+        try:
+            if not self.stream.closed:
+                self.stream.flush()
+                self.stream.close()
+            self._dirty.set()  # Let the flusher thread see the closed stream and exit
+        finally:
+            self.release()
+            super().close()
+
+# Configure logging: records are queued on the caller's thread and written
+# by a background listener so disk I/O never runs on the event loop
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [BufferedFileHandler('automation.log'), logging.StreamHandler()]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+logging.getLogger().setLevel(logging.INFO)
+logging.getLogger().addHandler(logging.handlers.QueueHandler(_log_queue))
 logger = logging.getLogger(__name__)
 
 class TaskStatus(Enum):
@@ -30,17 +114,86 @@ class TaskStatus(Enum):
     FAILED = "failed"
     PAUSED = "paused"
 
-@dataclass
+def take_clock_anchor() -> Tuple[float, int]:
+    """Pair a wall-clock reading with the monotonic clock.
+    
+    Tasks take their own anchor when they start, so monotonic step
+    timestamps map back to datetimes without drifting from wall-clock
+    adjustments made since the process started.
+    """
+    return time.time(), time.monotonic_ns()
+
+def monotonic_to_datetime(timestamp_ns: int, anchor: Tuple[float, int]) -> datetime:
+    """Convert a ``time.monotonic_ns()`` reading to a local datetime."""
+    wall, mono = anchor
+    return datetime.fromtimestamp(wall + (timestamp_ns - mono) / 1e9)
+
+# Step detail values larger than this many bytes are held zstd-compressed
+DETAIL_COMPRESS_THRESHOLD = 1024
+
+_zstd_compressor = zstandard.ZstdCompressor(level=3)
+_zstd_decompressor = zstandard.ZstdDecompressor()
+
+def compress_details(details: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace large string/bytes values with JSON-safe zstd envelopes."""
+    packed = None
+    for key, value in details.items():
+        if not isinstance(value, (str, bytes)) or len(value) <= DETAIL_COMPRESS_THRESHOLD:
+            continue
+        
+        raw = value.encode() if isinstance(value, str) else value
+        if packed is None:
+            packed = dict(details)
+        packed[key] = {
+            "_zstd": base64.b64encode(_zstd_compressor.compress(raw)).decode(),
+            "_type": "str" if isinstance(value, str) else "bytes"
+        }
+    
+    return details if packed is None else packed
+
+def inflate_details(details: Dict[str, Any]) -> Dict[str, Any]:
+    """Reverse :func:`compress_details`."""
+    inflated = None
+    for key, value in details.items():
+        if not (isinstance(value, dict) and "_zstd" in value):
+            continue
+        
+        raw = _zstd_decompressor.decompress(base64.b64decode(value["_zstd"]))
+        if inflated is None:
+            inflated = dict(details)
+        inflated[key] = raw.decode() if value.get("_type") == "str" else raw
+    
+    return details if inflated is None else inflated
+
+@dataclass(slots=True)
 class TaskStep:
     step_id: str
     action: str
-    timestamp: datetime
+    timestamp: int  # time.monotonic_ns()
     status: TaskStatus
     details: Dict[str, Any]
+    clock_anchor: Tuple[float, int]  # Anchor of the owning task
     duration: Optional[float] = None
     error: Optional[str] = None
+    
+    @property
+    def wall_time(self) -> datetime:
+        """Wall-clock time at which the step was recorded."""
+        return monotonic_to_datetime(self.timestamp, self.clock_anchor)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the step in a single pass."""
+        return {
+            "step_id": self.step_id,
+            "action": self.action,
+            "timestamp": self.wall_time.isoformat(),
+            "status": self.status.value,
+            "details": inflate_details(self.details),
+            "duration": self.duration,
+            "error": self.error
+        }
 
-@dataclass
+@dataclass(slots=True)
 class AutomationTask:
     task_id: str
     description: str
@@ -48,94 +201,468 @@ class AutomationTask:
     created_at: datetime
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
-    steps: List[TaskStep] = None
+    steps: List[TaskStep] = field(default_factory=list)
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
+    clock_anchor: Tuple[float, int] = field(default_factory=take_clock_anchor)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the task and its steps in a single pass."""
+        return {
+            "task_id": self.task_id,
+            "description": self.description,
+            "status": self.status.value,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "steps": [step.to_dict() for step in self.steps],
+            "result": self.result,
+            "error": self.error
+        }
+
+@dataclass(slots=True)
+class PerfMetrics:
+    total: int = 0
+    successful: int = 0
+    failed: int = 0
+    cache_hits: int = 0  # Successful tasks served from the act cache
+    duration_sum: float = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize metrics, deriving the average on demand."""
+        agent_runs = self.successful - self.cache_hits
+        return {
+            'total_tasks': self.total,
+            'successful_tasks': self.successful,
+            'failed_tasks': self.failed,
+            'cache_hits': self.cache_hits,
+            'average_task_duration': self.duration_sum / agent_runs if agent_runs else 0.0
+        }
+
+# On-disk location of the agent result cache
+ACT_CACHE_PATH = Path.home() / '.cache' / 'ai-agent' / 'act_cache.json'
+
+@functools.lru_cache(maxsize=1)
+def _persisted_act_cache() -> OrderedDict:
+    """Agent results persisted by earlier runs, read once per process.
+    
+    Results are held as encoded JSON, like the per-backend caches.
+    """
+    try:
+        entries = orjson.loads(ACT_CACHE_PATH.read_bytes())
+    except FileNotFoundError:
+        return OrderedDict()
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable act cache: {e}")
+        return OrderedDict()
+    return OrderedDict((key, orjson.dumps(result)) for key, result in entries.items())
+
+def _write_act_cache(entries: Dict[str, bytes]):
+    """Write encoded act cache entries to disk; runs on the report pool."""
+    ACT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    write_json_report(str(ACT_CACHE_PATH), {key: orjson.loads(blob) for key, blob in entries.items()})
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create a keep-alive HTTP client for LLM API calls."""
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=50, keepalive_expiry=10)
+    )
+
+# Leading "navigate to <url>" instruction that can run before the first LLM step.
+# Only explicit http(s) URLs qualify: bare dotted words such as "settings.json"
+# or "e.g" would otherwise be taken for hosts.
+_NAVIGATE_RE = re.compile(
+    r'^\s*(?:navigate to|go to|visit|open)\s+(https?://[^\s,]+)',
+    re.IGNORECASE
+)
+
+def extract_start_url(description: str) -> Optional[str]:
+    """Return the URL a task opens with, if it starts with a navigation."""
+    match = _NAVIGATE_RE.match(description)
+    return match.group(1).rstrip('.;:)') if match else None
+
+def _deep_merge(base: Mapping[str, Any], override: Mapping[str, Any]) -> Dict[str, Any]:
+    """Recursively merge ``override`` onto ``base`` into a new plain dict."""
+    merged: Dict[str, Any] = {}
+    for key in {**base, **override}:
+        base_value = base.get(key)
+        value = override.get(key, base_value)
+        if isinstance(value, Mapping):
+            value = _deep_merge(base_value if isinstance(base_value, Mapping) else {}, value)
+        merged[key] = value
+    return merged
+
+# Default backend configuration tuned for performance; never mutated
+_DEFAULT_CONFIG = freeze({
+    'browser': {
+        'headless': False,
+        'window_size': {'width': 1920, 'height': 1080},
+        'highlight_elements': True,
+        'wait_between_actions': 0.3,  # Faster than default
+        'enable_default_extensions': True,
+        'disable_images': False,  # Set to True for faster loading
+        'disable_javascript': False,
+        'user_agent': None,
+        'proxy': None
+    },
+    'llm': {
+        'model': 'gemini-2.5-flash',
+        'temperature': 0.1,  # More deterministic
+        'max_tokens': 4000
+    },
+    'performance': {
+        'max_steps': 50,
+        'timeout': 300,  # 5 minutes, hard ceiling for the whole run
+        'per_step_timeout': 30,  # Deadline for a single agent step
+        'step_retries': 0,  # Re-runs of a timed-out step; a re-run may repeat its side effects
+        'retry_attempts': 3,
+        'parallel_tasks': False,
+        'pool_size': 4,
+        'act_cache_size': 0,  # Opt-in result cache; only safe for tasks without side effects
+        'navigate_fast_path': True  # Open the task's start URL without an LLM round-trip
+    },
+    'tracking': {
+        'save_screenshots': True,
+        'save_html': False,
+        'log_level': 'INFO',
+        'max_live_tasks': 10_000,  # Older tasks are archived to disk
+        'task_ttl': 3600,
+        'archive_dir': 'task_archive'
+    }
+})
+
+_report_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_report_stamp = (0, '')
+
+def report_timestamp() -> str:
+    """Local ``YYYYmmdd_HHMMSS`` stamp for report filenames, cached per second."""
+    global _report_stamp
+    now = int(time.time())
+    if _report_stamp[0] != now:
+        _report_stamp = (now, time.strftime('%Y%m%d_%H%M%S', time.localtime(now)))
+    return _report_stamp[1]
+
+def get_report_pool() -> concurrent.futures.ThreadPoolExecutor:
+    """Thread pool shared by all backends for writing task reports.
+    
+    Threads rather than processes: forking alongside the log listener and
+    the event loop is unsafe, and pickling a report to a worker process
+    costs about as much as encoding it.
+    """
+    global _report_pool
+    if _report_pool is None:
+        _report_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix='report')
+    return _report_pool
+
+# Smoothing factor for per-task cost estimates used by run_tasks
+TASK_COST_EMA_ALPHA = 0.3
+
+# Task being run in the current coroutine context; keeps concurrent runs apart
+_current_task: ContextVar[Optional[AutomationTask]] = ContextVar('current_task', default=None)
+
+# Step updates waiting for callbacks; beyond this, new updates are dropped
+STEP_CALLBACK_QUEUE_SIZE = 1000
+
+def _is_async_callable(callback: Callable) -> bool:
+    """Whether calling ``callback`` returns a coroutine, including for
+    partials and objects with an ``async def __call__``."""
+    return inspect.iscoroutinefunction(callback) or inspect.iscoroutinefunction(
+        getattr(callback, '__call__', None)
+    )
+
+# Number of tasks a pooled browser serves before it is closed and relaunched
+BROWSER_POOL_RECYCLE_AFTER = 100
+
+class BrowserPool:
+    """Fixed-size pool of reusable browser instances checked out per task.
+    
+    Pooled browsers are kept alive between checkouts along with their
+    cookies, storage, tabs and logged-in sessions, so a pool must only be
+    shared by tasks run on behalf of the same user.
+    """
+    
+    def __init__(self, factory: Callable[[], Browser], size: int = 4,
+                 recycle_after: int = BROWSER_POOL_RECYCLE_AFTER):
+        self._factory = factory
+        self.size = size
+        self.recycle_after = recycle_after
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self._contexts_served: Dict[int, int] = {}
+        self.launched = 0
+        self.recycled = 0
+        
+        for _ in range(size):
+            self._queue.put_nowait(self._launch())
+    
+    def _launch(self) -> Browser:
+        """Create a new browser for a pool slot."""
+        browser = self._factory()
+        self._contexts_served[id(browser)] = 0
+        self.launched += 1
+        return browser
+    
+    async def acquire(self) -> Browser:
+        """Check out a browser, waiting if every slot is busy."""
+        return await self._queue.get()
+    
+    async def release(self, browser: Browser, healthy: bool = True):
+        """Return a browser to the pool, replacing it if it is unhealthy or worn out.
+        
+        A browser whose task failed may have crashed or been left mid-action,
+        so it is closed and relaunched rather than handed to the next task.
+        """
+        served = self._contexts_served.pop(id(browser), 0) + 1
+        
+        if not healthy or served >= self.recycle_after:
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.warning(f"Error closing recycled browser: {e}")
+            browser = self._launch()
+            self.recycled += 1
+        else:
+            self._contexts_served[id(browser)] = served
+        
+        self._queue.put_nowait(browser)
+    
+    async def close(self):
+        """Close every idle browser held by the pool."""
+        while not self._queue.empty():
+            browser = self._queue.get_nowait()
+            self._contexts_served.pop(id(browser), None)
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.warning(f"Error closing pooled browser: {e}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool utilisation statistics."""
+        return {
+            'size': self.size,
+            'available': self._queue.qsize(),
+            'launched': self.launched,
+            'recycled': self.recycled,
+            'contexts_served': sum(self._contexts_served.values())
+        }
+
+class StepTimeoutError(TimeoutError):
+    """Raised when an agent step exceeds its per-step deadline."""
+
+class StepDeadlineAgent(Agent):
+    """Agent that bounds every step with its own deadline.
+    
+    A step that times out fails the task by default. ``step_retries`` re-runs
+    it instead, but a step cancelled mid-action may already have clicked or
+    submitted something, so only enable retries for tasks that are safe to
+    repeat.
+    """
+    
+    def __init__(self, *args, per_step_timeout: float = 30, step_retries: int = 0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._per_step_timeout = per_step_timeout
+        self._step_attempts = 1 + max(0, step_retries)
+    
+    async def step(self, *args, **kwargs):
+        for attempt in range(1, self._step_attempts + 1):
+            deadline = asyncio.timeout(self._per_step_timeout)
+            try:
+                async with deadline:
+                    return await super().step(*args, **kwargs)
+            except TimeoutError:
+                # Only our own deadline is retried; other timeouts belong to the step
+                if not deadline.expired():
+                    raise
+                logger.warning(
+                    f"Agent step exceeded {self._per_step_timeout}s "
+                    f"(attempt {attempt}/{self._step_attempts})"
+                )
+        
+        raise StepTimeoutError(
+            f"Agent step timed out {self._step_attempts} time(s) after {self._per_step_timeout}s each"
+        )
+
+class TaskStore(TTLCache):
+    """Bounded, expiring task registry that archives tasks as they are evicted.
+    
+    Expiry only runs when the store is written to or :meth:`expire` is
+    called, so readers should call :meth:`expire` before looking a task up.
+    Running tasks are never expired; their TTL restarts instead. Size
+    eviction can still drop a running task, in which case ``run_task``
+    archives it again once it finishes.
+    """
     
-    def __post_init__(self):
-        if self.steps is None:
-            self.steps = []
+    def __init__(self, maxsize: int, ttl: float, on_evict: Callable[[AutomationTask], None]):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self._on_evict = on_evict
+    
+    def popitem(self):
+        key, task = super().popitem()
+        self._on_evict(task)
+        return key, task
+    
+    def expire(self, time=None):
+        expired = []
+        for key, task in super().expire(time):
+            if task.status is TaskStatus.RUNNING:
+                self[key] = task
+            else:
+                self._on_evict(task)
+                expired.append((key, task))
+        return expired
 
 class BrowserAutomationBackend:
     """Enhanced browser automation backend with performance optimizations and tracking."""
     
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+    def __init__(self, config: Optional[Dict[str, Any]] = None,
+                 http_client: Optional[httpx.AsyncClient] = None):
         self.config = self._load_config(config)
-        self.tasks: Dict[str, AutomationTask] = {}
-        self.current_task: Optional[AutomationTask] = None
+        self._config_hash = hashlib.blake2b(
+            orjson.dumps(self.config, default=str, option=orjson.OPT_SORT_KEYS)
+        ).hexdigest()
+        # Steps reference the browser config by content hash; reports carry it once
+        self._browser_cfg_blob = orjson.dumps(self.config['browser'], default=str, option=orjson.OPT_SORT_KEYS)
+        self._browser_cfg_id = hashlib.blake2b(self._browser_cfg_blob, digest_size=8).hexdigest()
+        # Share a caller-provided client across backends; otherwise own one
+        self._owns_http = http_client is None
+        self._http = http_client or create_http_client()
+        tracking_config = self.config['tracking']
+        self.tasks: Dict[str, AutomationTask] = TaskStore(
+            maxsize=tracking_config.get('max_live_tasks', 10_000),
+            ttl=tracking_config.get('task_ttl', 3600),
+            on_evict=self._archive_task
+        )
+        self._task_cost_ema: Dict[str, float] = {}
         self.step_callbacks: List[Callable] = []
-        self.performance_metrics = {
-            'total_tasks': 0,
-            'successful_tasks': 0,
-            'failed_tasks': 0,
-            'average_task_duration': 0.0
-        }
+        self._step_queue: asyncio.Queue = asyncio.Queue(maxsize=STEP_CALLBACK_QUEUE_SIZE)
+        self._step_worker: Optional[asyncio.Task] = None
+        self._perf = PerfMetrics()
+        self._report_pool = get_report_pool()
+        self._pool = BrowserPool(
+            self._create_browser,
+            size=self.config['performance'].get('pool_size', 4)
+        )
+        self._act_cache_size = self.config['performance'].get('act_cache_size', 0)
+        # Results are kept as encoded JSON: only serializable results are cached
+        # and every hit decodes a fresh copy the caller is free to mutate
+        self._act_cache: OrderedDict[str, bytes] = self._load_act_cache()
         
     def _load_config(self, config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         """Load configuration with defaults for optimal performance."""
-        default_config = {
-            'browser': {
-                'headless': False,
-                'window_size': {'width': 1920, 'height': 1080},
-                'highlight_elements': True,
-                'wait_between_actions': 0.3,  # Faster than default
-                'enable_default_extensions': True,
-                'disable_images': False,  # Set to True for faster loading
-                'disable_javascript': False,
-                'user_agent': None,
-                'proxy': None
-            },
-            'llm': {
-                'model': 'gemini-2.5-flash',
-                'temperature': 0.1,  # More deterministic
-                'max_tokens': 4000
-            },
-            'performance': {
-                'max_steps': 50,
-                'timeout': 300,  # 5 minutes
-                'retry_attempts': 3,
-                'parallel_tasks': False
-            },
-            'tracking': {
-                'save_screenshots': True,
-                'save_html': False,
-                'log_level': 'INFO'
-            }
-        }
+        return _deep_merge(_DEFAULT_CONFIG, config or {})
+    
+    def add_step_callback(self, callback: Callable[[TaskStep], Union[None, Awaitable[None]]]):
+        """Add callback to be called after each step.
         
-        if config:
-            # Deep merge configuration
-            for key, value in config.items():
-                if key in default_config and isinstance(value, dict):
-                    default_config[key].update(value)
-                else:
-                    default_config[key] = value
-                    
-        return default_config
-    
-    def add_step_callback(self, callback: Callable[[TaskStep], None]):
-        """Add callback to be called after each step."""
+        Steps are queued and delivered in order by a background task, so a slow
+        callback delays later updates but never the agent. Coroutine callbacks
+        run concurrently on the event loop; plain callables are run in a worker
+        thread. Either way ``current_task`` is the step's task.
+        """
         self.step_callbacks.append(callback)
     
-    def _create_browser(self) -> Browser:
-        """Create optimized browser instance."""
+    @functools.cached_property
+    def _browser_kwargs(self) -> Dict[str, Any]:
+        """Browser launch arguments, assembled once per backend."""
         browser_config = self.config['browser']
-        return Browser(
-            headless=browser_config['headless'],
-            window_size=browser_config['window_size'],
-            highlight_elements=browser_config['highlight_elements'],
-            wait_between_actions=browser_config['wait_between_actions'],
-            enable_default_extensions=browser_config['enable_default_extensions']
-        )
+        return {
+            'headless': browser_config['headless'],
+            'window_size': browser_config['window_size'],
+            'highlight_elements': browser_config['highlight_elements'],
+            'wait_between_actions': browser_config['wait_between_actions'],
+            'enable_default_extensions': browser_config['enable_default_extensions'],
+            'keep_alive': True  # Pooled browsers outlive a single agent run
+        }
+    
+    def _create_browser(self) -> Browser:
+        """Create optimized browser instance for the pool."""
+        return Browser(**self._browser_kwargs)
+    
+    def _load_act_cache(self) -> OrderedDict:
+        """Load persisted agent results from previous runs."""
+        if not self._act_cache_size:
+            return OrderedDict()
+        
+        return OrderedDict(list(_persisted_act_cache().items())[-self._act_cache_size:])
+    
+    async def save_act_cache(self):
+        """Persist cached agent results so they survive restarts.
+        
+        Entries are merged into the process-wide copy so backends sharing the
+        file keep each other's results. The file is written on the report
+        pool and replaced atomically.
+        """
+        if not self._act_cache_size or not self._act_cache:
+            return
+        
+        entries = _persisted_act_cache()
+        for key, blob in self._act_cache.items():
+            entries.pop(key, None)
+            entries[key] = blob
+        while len(entries) > self._act_cache_size:
+            entries.popitem(last=False)
+        
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._report_pool, _write_act_cache, dict(entries))
+        except OSError as e:
+            logger.warning(f"Failed to save act cache: {e}")
+    
+    def _act_cache_key(self, description: str, schema: Optional[Dict]) -> str:
+        """Build a deterministic cache key for an agent run."""
+        payload = json.dumps({
+            "task": description,
+            "schema": schema,
+            "config": self._config_hash
+        }, sort_keys=True, default=json_default)
+        return hashlib.sha256(payload.encode()).hexdigest()
     
-    def _create_llm(self) -> ChatGoogle:
-        """Create LLM instance with optimized settings."""
+    def _act_cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a copy of a cached agent result, refreshing its LRU position."""
+        blob = self._act_cache.get(key)
+        if blob is None:
+            return None
+        self._act_cache.move_to_end(key)
+        return orjson.loads(blob)
+    
+    def _act_cache_set(self, key: str, result: Dict[str, Any]):
+        """Store an agent result, evicting the least recently used entry."""
+        if not self._act_cache_size:
+            return
+        
+        try:
+            blob = orjson.dumps(result)
+        except TypeError:
+            logger.debug(f"Not caching result that is not JSON-serializable: {key}")
+            return
+        self._act_cache[key] = blob
+        self._act_cache.move_to_end(key)
+        while len(self._act_cache) > self._act_cache_size:
+            self._act_cache.popitem(last=False)
+    
+    async def _acquire_browser(self) -> Browser:
+        """Check out a pre-launched browser from the pool."""
+        return await self._pool.acquire()
+    
+    async def _release_browser(self, browser: Browser, healthy: bool = True):
+        """Return a browser to the pool after a task finishes."""
+        await self._pool.release(browser, healthy)
+    
+    @functools.cached_property
+    def llm(self) -> ChatGoogle:
+        """Shared LLM client reused across tasks to keep prompt prefixes cacheable."""
         llm_config = self.config['llm']
         return ChatGoogle(
             model=llm_config['model'],
-            temperature=llm_config.get('temperature', 0.1)
+            temperature=llm_config.get('temperature', 0.1),
+            http_options={'httpx_async_client': self._http}  # Reuse pooled TLS connections
         )
     
+    @property
+    def current_task(self) -> Optional[AutomationTask]:
+        """Task being run by the calling coroutine, if any."""
+        return _current_task.get()
+    
     def create_task(self, task_id: str, description: str) -> AutomationTask:
         """Create a new automation task."""
         task = AutomationTask(
@@ -148,30 +675,62 @@ class BrowserAutomationBackend:
         logger.info(f"Created task {task_id}: {description}")
         return task
     
-    def _track_step(self, action: str, details: Dict[str, Any], status: TaskStatus = TaskStatus.COMPLETED, error: Optional[str] = None):
-        """Track a step in the current task."""
-        if not self.current_task:
-            return
+    def _step_tracker(self, task: AutomationTask) -> Callable[..., Awaitable[None]]:
+        """Build a step recorder for ``task`` with its hot lookups pre-bound."""
+        steps = task.steps
+        append = steps.append
+        now_ns = time.monotonic_ns
+        callbacks = self.step_callbacks
+        dispatch = self._dispatch_step_callbacks
+        log_steps = logger.isEnabledFor(logging.INFO)
+        
+        async def track(action: str, details: Dict[str, Any], status: TaskStatus = TaskStatus.COMPLETED,
+                        error: Optional[str] = None):
+            step = TaskStep(f"step_{len(steps) + 1}", action, now_ns(), status, compress_details(details),
+                            task.clock_anchor, error=error)
+            append(step)
             
-        step = TaskStep(
-            step_id=f"step_{len(self.current_task.steps) + 1}",
-            action=action,
-            timestamp=datetime.now(),
-            status=status,
-            details=details,
-            error=error
-        )
+            if callbacks:
+                dispatch(task, step)
+            
+            if log_steps:
+                logger.info(f"Step {step.step_id}: {action} - {status.value}")
         
-        self.current_task.steps.append(step)
+        return track
+    
+    def _dispatch_step_callbacks(self, task: AutomationTask, step: TaskStep):
+        """Queue a step for the callback worker without waiting on callbacks."""
+        if self._step_worker is None or self._step_worker.done():
+            self._step_worker = asyncio.create_task(self._run_step_callbacks())
         
-        # Call callbacks
-        for callback in self.step_callbacks:
-            try:
-                callback(step)
-            except Exception as e:
-                logger.error(f"Error in step callback: {e}")
+        try:
+            self._step_queue.put_nowait((task, step))
+        except asyncio.QueueFull:
+            logger.warning(f"Step callbacks are falling behind; dropped {step.step_id} of task {task.task_id}")
+    
+    async def _run_step_callbacks(self):
+        """Deliver queued steps to all callbacks, one step at a time."""
+        async def call(callback: Callable, step: TaskStep):
+            if _is_async_callable(callback):
+                result = callback(step)
+            else:
+                # to_thread copies the context, so current_task is visible there too
+                result = await asyncio.to_thread(callback, step)
+            if inspect.isawaitable(result):
+                await result
         
-        logger.info(f"Step {step.step_id}: {action} - {status.value}")
+        while True:
+            task, step = await self._step_queue.get()
+            # Callbacks see the step's task as current_task, as they would inline
+            token = _current_task.set(task)
+            try:
+                calls = [call(callback, step) for callback in self.step_callbacks]
+                for outcome in await asyncio.gather(*calls, return_exceptions=True):
+                    if isinstance(outcome, Exception):
+                        logger.error(f"Error in step callback: {outcome}")
+            finally:
+                _current_task.reset(token)
+                self._step_queue.task_done()
     
     async def run_task(self, task_id: str, structured_output_schema: Optional[Dict] = None) -> Dict[str, Any]:
         """Run an automation task with comprehensive tracking."""
@@ -179,37 +738,82 @@ class BrowserAutomationBackend:
             raise ValueError(f"Task {task_id} not found")
         
         task = self.tasks[task_id]
-        self.current_task = task
+        current_token = _current_task.set(task)
+        track = self._step_tracker(task)
+        browser = None
+        browser_healthy = True
         
         try:
             # Update task status
             task.status = TaskStatus.RUNNING
             task.started_at = datetime.now()
+            task.clock_anchor = take_clock_anchor()
             
-            self._track_step("task_started", {"task_id": task_id, "description": task.description})
+            await track("task_started", {"task_id": task_id, "description": task.description})
+            
+            # Serve repeated tasks from the result cache
+            cache_key = None
+            if self._act_cache_size:
+                cache_key = self._act_cache_key(task.description, structured_output_schema)
+            cached = self._act_cache_get(cache_key) if cache_key else None
+            if cached is not None:
+                task.status = TaskStatus.COMPLETED
+                task.completed_at = datetime.now()
+                task.result = cached
+                
+                await track("cache_hit", {"cache_key": cache_key})
+                
+                perf = self._perf
+                perf.total += 1
+                perf.successful += 1
+                perf.cache_hits += 1
+                
+                logger.info(f"Task {task_id} served from cache")
+                
+                return {
+                    "task_id": task_id,
+                    "status": "completed",
+                    "result": task.result,
+                    "duration": 0.0,
+                    "steps_count": len(task.steps),
+                    "cache_hit": True
+                }
             
             # Create browser and LLM
-            browser = self._create_browser()
-            llm = self._create_llm()
+            browser = await self._acquire_browser()
             
-            self._track_step("browser_created", {"config": self.config['browser']})
+            await track("browser_created", {"config_id": self._browser_cfg_id})
             
             # Create agent with enhanced configuration
             agent_kwargs = {
                 'task': task.description,
-                'llm': llm,
+                'llm': self.llm,
                 'browser': browser,
                 'max_steps': self.config['performance']['max_steps']
             }
             
             if structured_output_schema:
-                agent_kwargs['structured_output'] = structured_output_schema
+                # Shared schemas are read-only views; give the agent its own copy
+                agent_kwargs['structured_output'] = thaw(structured_output_schema)
             
-            agent = Agent(**agent_kwargs)
+            start_url = None
+            if self.config['performance'].get('navigate_fast_path', True):
+                start_url = extract_start_url(task.description)
+                if start_url:
+                    agent_kwargs['initial_actions'] = [{'go_to_url': {'url': start_url}}]
+            
+            agent = StepDeadlineAgent(
+                **agent_kwargs,
+                per_step_timeout=self.config['performance'].get('per_step_timeout', 30),
+                step_retries=self.config['performance'].get('step_retries', 0)
+            )
             
-            self._track_step("agent_created", {"max_steps": self.config['performance']['max_steps']})
+            await track("agent_created", {
+                "max_steps": self.config['performance']['max_steps'],
+                "start_url": start_url
+            })
             
-            # Run the agent with timeout
+            # Run the agent; steps enforce their own deadlines, this is the overall ceiling
             start_time = time.time()
             
             try:
@@ -224,16 +828,20 @@ class BrowserAutomationBackend:
                 task.status = TaskStatus.COMPLETED
                 task.completed_at = datetime.now()
                 task.result = result if isinstance(result, dict) else {"output": str(result)}
+                if cache_key:
+                    self._act_cache_set(cache_key, task.result)
                 
-                self._track_step("task_completed", {
+                await track("task_completed", {
                     "duration": duration,
                     "result_type": type(result).__name__
                 })
                 
                 # Update performance metrics
-                self.performance_metrics['total_tasks'] += 1
-                self.performance_metrics['successful_tasks'] += 1
-                self._update_average_duration(duration)
+                perf = self._perf
+                perf.total += 1
+                perf.successful += 1
+                perf.duration_sum += duration
+                self._record_task_cost(task.description, duration)
                 
                 logger.info(f"Task {task_id} completed successfully in {duration:.2f}s")
                 
@@ -245,26 +853,32 @@ class BrowserAutomationBackend:
                     "steps_count": len(task.steps)
                 }
                 
+            except StepTimeoutError:
+                # A per-step deadline, reported as an ordinary failure below rather
+                # than as the overall run timeout
+                raise
             except asyncio.TimeoutError:
                 error_msg = f"Task {task_id} timed out after {self.config['performance']['timeout']}s"
                 task.status = TaskStatus.FAILED
                 task.error = error_msg
-                self._track_step("task_timeout", {"timeout": self.config['performance']['timeout']}, TaskStatus.FAILED, error_msg)
+                await track("task_timeout", {"timeout": self.config['performance']['timeout']}, TaskStatus.FAILED, error_msg)
                 raise TimeoutError(error_msg)
                 
         except Exception as e:
             duration = time.time() - start_time if 'start_time' in locals() else 0
             error_msg = str(e)
+            browser_healthy = False
             
             task.status = TaskStatus.FAILED
             task.error = error_msg
             task.completed_at = datetime.now()
             
-            self._track_step("task_failed", {"error": error_msg, "duration": duration}, TaskStatus.FAILED, error_msg)
+            await track("task_failed", {"error": error_msg, "duration": duration}, TaskStatus.FAILED, error_msg)
             
             # Update performance metrics
-            self.performance_metrics['total_tasks'] += 1
-            self.performance_metrics['failed_tasks'] += 1
+            self._perf.total += 1
+            self._perf.failed += 1
+            self._record_task_cost(task.description, duration)
             
             logger.error(f"Task {task_id} failed: {error_msg}")
             
@@ -277,25 +891,104 @@ class BrowserAutomationBackend:
             }
         
         finally:
-            self.current_task = None
+            if browser is not None:
+                await self._release_browser(browser, browser_healthy)
+            # Evicted for size while running: replace its mid-run archive
+            if self.tasks.get(task_id) is not task:
+                self._archive_task(task)
+            _current_task.reset(current_token)
     
-    def _update_average_duration(self, duration: float):
-        """Update average task duration metric."""
-        total_successful = self.performance_metrics['successful_tasks']
-        current_avg = self.performance_metrics['average_task_duration']
+    async def run_tasks(self, task_ids: List[str], structured_output_schema: Optional[Dict] = None) -> List[Dict[str, Any]]:
+        """Run several tasks, dispatching the longest expected ones first.
         
-        if total_successful == 1:
-            self.performance_metrics['average_task_duration'] = duration
-        else:
-            # Calculate running average
-            self.performance_metrics['average_task_duration'] = (
-                (current_avg * (total_successful - 1) + duration) / total_successful
-            )
+        Up to ``pool_size`` tasks run concurrently when ``parallel_tasks`` is
+        enabled; results are returned in the order of ``task_ids``.
+        """
+        missing = [task_id for task_id in task_ids if task_id not in self.tasks]
+        if missing:
+            raise ValueError(f"Tasks not found: {', '.join(missing)}")
+        
+        perf_config = self.config['performance']
+        workers = perf_config.get('pool_size', 4) if perf_config.get('parallel_tasks') else 1
+        semaphore = asyncio.Semaphore(workers)
+        
+        # Longest-processing-time first: workers pick up the next-longest job as they free up
+        ordered = sorted(
+            task_ids,
+            key=lambda task_id: self._estimate_task_cost(self.tasks[task_id].description),
+            reverse=True
+        )
+        
+        async def run_gated(task_id: str):
+            async with semaphore:
+                return task_id, await self.run_task(task_id, structured_output_schema)
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        for completed in asyncio.as_completed([asyncio.ensure_future(run_gated(task_id)) for task_id in ordered]):
+            task_id, result = await completed
+            results[task_id] = result
+        
+        return [results[task_id] for task_id in task_ids]
+    
+    @staticmethod
+    def _task_cost_key(description: str) -> str:
+        """Group similar tasks by a normalized description prefix."""
+        return description.lower()[:32]
+    
+    def _estimate_task_cost(self, description: str) -> float:
+        """Estimate a task's duration from previous runs of similar tasks."""
+        estimate = self._task_cost_ema.get(self._task_cost_key(description))
+        if estimate is not None:
+            return estimate
+        if self._task_cost_ema:
+            return sum(self._task_cost_ema.values()) / len(self._task_cost_ema)
+        return 0.0
+    
+    def _record_task_cost(self, description: str, duration: float):
+        """Fold an observed duration into the moving-average cost estimate."""
+        key = self._task_cost_key(description)
+        previous = self._task_cost_ema.get(key)
+        self._task_cost_ema[key] = duration if previous is None else (
+            TASK_COST_EMA_ALPHA * duration + (1 - TASK_COST_EMA_ALPHA) * previous
+        )
+    
+    def _archive_path(self, task_id: str) -> Path:
+        return Path(self.config['tracking'].get('archive_dir', 'task_archive')) / f"{task_id}.json"
+    
+    def _archive_task(self, task: AutomationTask):
+        """Write an evicted task to the archive directory."""
+        path = self._archive_path(task.task_id)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.error(f"Failed to archive task {task.task_id}: {e}")
+            return
+        
+        def log_failure(future: concurrent.futures.Future):
+            if future.exception():
+                logger.error(f"Failed to archive task {task.task_id}: {future.exception()}")
+        
+        future = self._report_pool.submit(write_json_report, str(path), self._build_report(task))
+        future.add_done_callback(log_failure)
+    
+    def _load_archived_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Read an archived task, if one has been written yet."""
+        try:
+            return orjson.loads(self._archive_path(task_id).read_bytes())["task"]
+        except (OSError, orjson.JSONDecodeError):
+            return None
     
     def get_task_status(self, task_id: str) -> Dict[str, Any]:
         """Get detailed status of a task."""
+        self.tasks.expire()
         if task_id not in self.tasks:
-            return {"error": f"Task {task_id} not found"}
+            archived = self._load_archived_task(task_id)
+            if archived is None:
+                return {"error": f"Task {task_id} not found"}
+            
+            status = {key: value for key, value in archived.items() if key != "steps"}
+            status["steps_count"] = len(archived["steps"])
+            return status
         
         task = self.tasks[task_id]
         return {
@@ -312,54 +1005,57 @@ class BrowserAutomationBackend:
     
     def get_task_steps(self, task_id: str) -> List[Dict[str, Any]]:
         """Get detailed steps of a task."""
+        self.tasks.expire()
         if task_id not in self.tasks:
-            return []
+            archived = self._load_archived_task(task_id)
+            return archived["steps"] if archived else []
         
-        task = self.tasks[task_id]
-        return [{
-            "step_id": step.step_id,
-            "action": step.action,
-            "timestamp": step.timestamp.isoformat(),
-            "status": step.status.value,
-            "details": step.details,
-            "duration": step.duration,
-            "error": step.error
-        } for step in task.steps]
+        return [step.to_dict() for step in self.tasks[task_id].steps]
     
     def get_performance_metrics(self) -> Dict[str, Any]:
         """Get performance metrics."""
-        return self.performance_metrics.copy()
+        metrics = self._perf.to_dict()
+        metrics['browser_pool'] = self._pool.get_stats()
+        return metrics
     
-    def save_task_report(self, task_id: str, filepath: Optional[str] = None) -> str:
-        """Save detailed task report to file."""
+    async def aclose(self):
+        """Release resources held by the backend."""
+        if self._step_worker is not None:
+            # Give queued step updates a moment to go out before stopping the worker
+            try:
+                await asyncio.wait_for(self._step_queue.join(), timeout=5)
+            except asyncio.TimeoutError:
+                logger.warning("Step callbacks did not finish; dropping queued updates")
+            self._step_worker.cancel()
+            self._step_worker = None
+        await self.save_act_cache()
+        await self._pool.close()
+        if self._owns_http:
+            await self._http.aclose()
+    
+    def _build_report(self, task: AutomationTask) -> Dict[str, Any]:
+        """Assemble the JSON-ready report for a task."""
+        task_dict = task.to_dict()
+        return {
+            "task": task_dict,
+            "steps": task_dict["steps"],
+            "configs": {self._browser_cfg_id: orjson.loads(self._browser_cfg_blob)},
+            "performance_metrics": self._perf.to_dict()
+        }
+    
+    async def save_task_report(self, task_id: str, filepath: Optional[str] = None) -> str:
+        """Save detailed task report to file off the event loop."""
         if task_id not in self.tasks:
             raise ValueError(f"Task {task_id} not found")
         
         task = self.tasks[task_id]
         
         if not filepath:
-            filepath = f"task_report_{task_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            filepath = f"task_report_{task_id}_{report_timestamp()}.json"
         
-        report = {
-            "task": asdict(task),
-            "steps": [asdict(step) for step in task.steps],
-            "performance_metrics": self.performance_metrics
-        }
-        
-        # Convert datetime objects to strings for JSON serialization
-        def convert_datetime(obj):
-            if isinstance(obj, datetime):
-                return obj.isoformat()
-            elif isinstance(obj, dict):
-                return {k: convert_datetime(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_datetime(item) for item in obj]
-            return obj
-        
-        report = convert_datetime(report)
-        
-        with open(filepath, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
+        # Serialize and write on a worker thread so file I/O stays off the event loop
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._report_pool, write_json_report, filepath, self._build_report(task))
         
         logger.info(f"Task report saved to {filepath}")
         return filepath
@@ -385,7 +1081,7 @@ async def main():
     
     # Add step callback for real-time monitoring
     def step_monitor(step: TaskStep):
-        print(f"[{step.timestamp.strftime('%H:%M:%S')}] {step.action}: {step.status.value}")
+        print(f"[{step.wall_time.strftime('%H:%M:%S')}] {step.action}: {step.status.value}")
         if step.error:
             print(f"  Error: {step.error}")
     
@@ -415,7 +1111,7 @@ async def main():
             print(f"Error: {result['error']}")
         
         # Save detailed report
-        report_file = backend.save_task_report(task_id)
+        report_file = await backend.save_task_report(task_id)
         print(f"\nDetailed report saved to: {report_file}")
         
         # Show performance metrics
@@ -431,10 +1127,13 @@ async def main():
         
         # Still save report for debugging
         try:
-            report_file = backend.save_task_report(task_id)
+            report_file = await backend.save_task_report(task_id)
             print(f"Debug report saved to: {report_file}")
         except:
             pass
+    
+    finally:
+        await backend.aclose()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
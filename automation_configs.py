@@ -1,11 +1,23 @@
 """Configuration templates for different automation scenarios."""
 
-from typing import Dict, Any, Optional
+import functools
+import logging
+import os
+from collections import deque
+from collections.abc import Mapping
+from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass
-import json
 from pathlib import Path
+from types import MappingProxyType
 
-@dataclass
+import orjson
+
+from automation_schemas import COMMON_SCHEMAS, schema_name_for_task
+from automation_utils import KeywordClassifier, freeze, json_default, thaw
+
+logger = logging.getLogger(__name__)
+
+@dataclass(slots=True, frozen=True)
 class AutomationConfig:
     """Base configuration class for automation tasks."""
     name: str
@@ -16,8 +28,18 @@ class AutomationConfig:
     tracking_config: Dict[str, Any]
     custom_settings: Optional[Dict[str, Any]] = None
 
-# Predefined configuration templates
-CONFIG_TEMPLATES = {
+# Fragments shared by several templates; freeze() keeps them shared
+_CHROMIUM_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-web-security",
+    "--disable-features=VizDisplayCompositor"
+]
+_WINDOW_FULL_HD = {"width": 1920, "height": 1080}
+
+# Predefined configuration templates, frozen at import so they can be shared
+CONFIG_TEMPLATES = freeze({
     "fast_automation": {
         "name": "Fast Automation",
         "description": "Optimized for speed with minimal visual feedback",
@@ -32,13 +54,7 @@ CONFIG_TEMPLATES = {
             "disable_images": True,
             "disable_javascript": False,
             "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-            "args": [
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-                "--disable-web-security",
-                "--disable-features=VizDisplayCompositor"
-            ]
+            "args": _CHROMIUM_ARGS
         },
         "llm_config": {
             "model": "gemini-2.5-flash",
@@ -65,19 +81,13 @@ CONFIG_TEMPLATES = {
             "headless": False,
             "browser_type": "chromium",
             "executable_path": "/usr/bin/chromium-browser",
-            "window_size": {"width": 1920, "height": 1080},
+            "window_size": _WINDOW_FULL_HD,
             "highlight_elements": True,
             "wait_between_actions": 1.0,
             "enable_default_extensions": True,
             "disable_images": False,
             "disable_javascript": False,
-            "args": [
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-                "--disable-web-security",
-                "--disable-features=VizDisplayCompositor"
-            ]
+            "args": _CHROMIUM_ARGS
         },
         "llm_config": {
             "model": "gemini-2.5-flash",
@@ -111,13 +121,7 @@ CONFIG_TEMPLATES = {
             "disable_images": False,
             "disable_javascript": False,
             "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "args": [
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-                "--disable-web-security",
-                "--disable-features=VizDisplayCompositor"
-            ]
+            "args": _CHROMIUM_ARGS
         },
         "llm_config": {
             "model": "gemini-2.5-flash",
@@ -149,19 +153,13 @@ CONFIG_TEMPLATES = {
             "headless": True,
             "browser_type": "chromium",
             "executable_path": "/usr/bin/chromium-browser",
-            "window_size": {"width": 1920, "height": 1080},
+            "window_size": _WINDOW_FULL_HD,
             "highlight_elements": False,
             "wait_between_actions": 0.5,
             "enable_default_extensions": False,
             "disable_images": True,
             "disable_javascript": False,
-            "args": [
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-                "--disable-web-security",
-                "--disable-features=VizDisplayCompositor"
-            ]
+            "args": _CHROMIUM_ARGS
         },
         "llm_config": {
             "model": "gemini-2.5-flash",
@@ -199,13 +197,7 @@ CONFIG_TEMPLATES = {
             "enable_default_extensions": True,
             "disable_images": False,
             "disable_javascript": False,
-            "args": [
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-                "--disable-web-security",
-                "--disable-features=VizDisplayCompositor"
-            ]
+            "args": _CHROMIUM_ARGS
         },
         "llm_config": {
             "model": "gemini-2.5-flash",
@@ -243,13 +235,7 @@ CONFIG_TEMPLATES = {
             "enable_default_extensions": True,
             "disable_images": False,
             "disable_javascript": False,
-            "args": [
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-                "--disable-web-security",
-                "--disable-features=VizDisplayCompositor"
-            ]
+            "args": _CHROMIUM_ARGS
         },
         "llm_config": {
             "model": "gemini-2.5-flash",
@@ -288,13 +274,7 @@ CONFIG_TEMPLATES = {
             "enable_default_extensions": True,
             "disable_images": False,
             "disable_javascript": False,
-            "args": [
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-                "--disable-web-security",
-                "--disable-features=VizDisplayCompositor"
-            ]
+            "args": _CHROMIUM_ARGS
         },
         "llm_config": {
             "model": "gemini-2.5-flash",
@@ -327,19 +307,13 @@ CONFIG_TEMPLATES = {
             "headless": True,
             "browser_type": "chromium",
             "executable_path": "/usr/bin/chromium-browser",
-            "window_size": {"width": 1920, "height": 1080},
+            "window_size": _WINDOW_FULL_HD,
             "highlight_elements": False,
             "wait_between_actions": 0.3,
             "enable_default_extensions": False,
             "disable_images": True,
             "disable_javascript": False,
-            "args": [
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-                "--disable-web-security",
-                "--disable-features=VizDisplayCompositor"
-            ]
+            "args": _CHROMIUM_ARGS
         },
         "llm_config": {
             "model": "gemini-2.5-flash",
@@ -364,7 +338,46 @@ CONFIG_TEMPLATES = {
             "test_coverage": True
         }
     }
-}
+})
+
+# Descriptions of the built-in templates, listed ahead of any config files
+_BUILTIN_DESCRIPTIONS: Mapping[str, str] = MappingProxyType(
+    {name: config["description"] for name, config in CONFIG_TEMPLATES.items()}
+)
+
+# Task keywords per configuration template, checked in priority order
+_CONFIG_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("fast_automation", ("fast", "quick", "speed", "batch", "bulk")),
+    ("stealth_automation", ("stealth", "undetected", "bypass", "avoid detection")),
+    ("data_extraction", ("scrape", "extract", "collect", "harvest", "data")),
+    ("form_automation", ("form", "fill", "submit", "register", "signup")),
+    ("ecommerce_automation", ("buy", "shop", "product", "cart", "price")),
+    ("social_media_automation", ("social", "post", "tweet", "facebook", "instagram")),
+    ("testing_automation", ("test", "verify", "check", "validate", "qa")),
+)
+
+_CONFIG_CLASSIFIER = KeywordClassifier(_CONFIG_KEYWORDS)
+
+# Config files larger than this are rejected instead of parsed
+MAX_CONFIG_FILE_SIZE = 1024 * 1024
+
+def _read_config_file(path: str, size: int) -> bytes:
+    """Read a config file whose size is already known from a directory scan."""
+    if size > MAX_CONFIG_FILE_SIZE:
+        raise ValueError(f"Config file {path} is larger than {MAX_CONFIG_FILE_SIZE} bytes")
+    
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        chunks = []
+        while size > 0:
+            chunk = os.read(fd, size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
 
 class ConfigManager:
     """Manager for automation configurations."""
@@ -372,47 +385,90 @@ class ConfigManager:
     def __init__(self, config_dir: Optional[str] = None):
         self.config_dir = Path(config_dir) if config_dir else Path("./configs")
         self.config_dir.mkdir(exist_ok=True)
+        # (directory mtime, newest file mtime) -> listing from the last scan
+        self._list_cache: Optional[Tuple[Tuple[int, int], Dict[str, str]]] = None
+        # config name -> (mtime, parsed config) so unchanged files are not reparsed
+        self._file_cache: Dict[str, Tuple[int, Mapping[str, Any]]] = {}
     
-    def get_config(self, config_name: str) -> Dict[str, Any]:
-        """Get a configuration by name."""
+    def get_config(self, config_name: str) -> Mapping[str, Any]:
+        """Get a configuration by name.
+        
+        Configurations are returned as shared read-only views; use ``thaw``
+        on the result before modifying it.
+        """
         if config_name in CONFIG_TEMPLATES:
-            return CONFIG_TEMPLATES[config_name].copy()
+            return CONFIG_TEMPLATES[config_name]
         
         # Try to load from file
         config_file = self.config_dir / f"{config_name}.json"
-        if config_file.exists():
-            with open(config_file, 'r') as f:
-                return json.load(f)
+        try:
+            stat = os.stat(config_file)
+        except FileNotFoundError:
+            raise ValueError(f"Configuration '{config_name}' not found") from None
+        
+        return self._load_config_file(config_name, str(config_file), stat)
+    
+    def _load_config_file(self, config_name: str, path: str, stat: os.stat_result) -> Mapping[str, Any]:
+        """Parse a config file, reusing the cached result while its mtime is unchanged."""
+        cached = self._file_cache.get(config_name)
+        if cached is not None and cached[0] == stat.st_mtime_ns:
+            return cached[1]
+        
+        config = orjson.loads(_read_config_file(path, stat.st_size))
+        if not isinstance(config, dict):
+            raise ValueError(f"Config file {path} does not contain a JSON object")
         
-        raise ValueError(f"Configuration '{config_name}' not found")
+        config = freeze(config)
+        self._file_cache[config_name] = (stat.st_mtime_ns, config)
+        return config
     
     def save_config(self, config_name: str, config: Dict[str, Any]) -> str:
         """Save a configuration to file."""
         config_file = self.config_dir / f"{config_name}.json"
-        with open(config_file, 'w') as f:
-            json.dump(config, f, indent=2)
+        data = orjson.dumps(config, default=json_default, option=orjson.OPT_INDENT_2)
+        config_file.write_bytes(data)
+        
+        # Seed the parsed-file cache so get_config doesn't read the file back
+        self._file_cache[config_name] = (os.stat(config_file).st_mtime_ns, freeze(orjson.loads(data)))
         return str(config_file)
     
     def list_configs(self) -> Dict[str, str]:
-        """List all available configurations."""
-        configs = {}
+        """List all available configurations.
+        
+        The directory scan is cached and only redone when the directory or one
+        of its config files has changed; files whose mtime is unchanged are
+        not reparsed.
+        """
+        with os.scandir(self.config_dir) as it:
+            entries = [(entry.name, entry.path, entry.stat())
+                       for entry in it
+                       if entry.name.endswith(".json") and entry.is_file()]
         
-        # Add built-in templates
-        for name, config in CONFIG_TEMPLATES.items():
-            configs[name] = config["description"]
+        cache_key = (os.stat(self.config_dir).st_mtime_ns,
+                     max((stat.st_mtime_ns for _, _, stat in entries), default=0))
+        if self._list_cache is not None and self._list_cache[0] == cache_key:
+            return dict(self._list_cache[1])
+        
+        # Start from the built-in templates
+        configs = dict(_BUILTIN_DESCRIPTIONS)
         
         # Add custom configs from files
-        for config_file in self.config_dir.glob("*.json"):
-            name = config_file.stem
-            if name not in configs:
-                try:
-                    with open(config_file, 'r') as f:
-                        config_data = json.load(f)
-                        configs[name] = config_data.get("description", "Custom configuration")
-                except:
-                    configs[name] = "Custom configuration (error loading)"
+        for file_name, path, stat in sorted(entries):
+            name = file_name[:-len(".json")]
+            if name in configs:
+                continue
+            try:
+                config_data = self._load_config_file(name, path, stat)
+                configs[name] = config_data.get("description", "Custom configuration")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to load config file {path}: {e}")
+                configs[name] = "Custom configuration (error loading)"
         
-        return configs
+        # Forget files that have been removed since the last scan
+        self._file_cache = {name: cached for name, cached in self._file_cache.items()
+                            if name in configs}
+        self._list_cache = (cache_key, configs)
+        return dict(configs)
     
     def create_custom_config(self, 
                            name: str,
@@ -420,16 +476,7 @@ class ConfigManager:
                            base_config: str = "visual_automation",
                            overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Create a custom configuration based on a template."""
-        base = self.get_config(base_config)
-        
-        if overrides:
-            # Deep merge overrides
-            for key, value in overrides.items():
-                if key in base and isinstance(value, dict) and isinstance(base[key], dict):
-                    base[key].update(value)
-                else:
-                    base[key] = value
-        
+        base = merge_configs(self.get_config(base_config), overrides or {})
         base["name"] = name
         base["description"] = description
         
@@ -437,54 +484,48 @@ class ConfigManager:
     
     def optimize_config_for_task(self, task_description: str) -> str:
         """Recommend the best configuration for a given task."""
-        task_lower = task_description.lower()
-        
-        # Speed-focused keywords
-        if any(keyword in task_lower for keyword in ['fast', 'quick', 'speed', 'batch', 'bulk']):
-            return "fast_automation"
-        
-        # Stealth keywords
-        elif any(keyword in task_lower for keyword in ['stealth', 'undetected', 'bypass', 'avoid detection']):
-            return "stealth_automation"
-        
-        # Data extraction keywords
-        elif any(keyword in task_lower for keyword in ['scrape', 'extract', 'collect', 'harvest', 'data']):
-            return "data_extraction"
-        
-        # Form keywords
-        elif any(keyword in task_lower for keyword in ['form', 'fill', 'submit', 'register', 'signup']):
-            return "form_automation"
-        
-        # E-commerce keywords
-        elif any(keyword in task_lower for keyword in ['buy', 'shop', 'product', 'cart', 'price']):
-            return "ecommerce_automation"
-        
-        # Social media keywords
-        elif any(keyword in task_lower for keyword in ['social', 'post', 'tweet', 'facebook', 'instagram']):
-            return "social_media_automation"
-        
-        # Testing keywords
-        elif any(keyword in task_lower for keyword in ['test', 'verify', 'check', 'validate', 'qa']):
-            return "testing_automation"
-        
-        # Default to visual for debugging and general use
-        else:
-            return "visual_automation"
+        return _config_name_for_task(task_description.lower())
+
+def _config_name_for_task(task_lower: str) -> str:
+    # Default to visual for debugging and general use
+    return _CONFIG_CLASSIFIER.classify(task_lower, "visual_automation")
 
-def get_recommended_config(task_description: str) -> Dict[str, Any]:
+def classify_task(task_description: str) -> Tuple[str, Mapping[str, Any]]:
+    """Pick both the configuration name and the output schema for a task.
+    
+    The description is lowercased once and shared by both keyword scans, so
+    callers that need both should prefer this over calling
+    ``optimize_config_for_task`` and ``get_schema_for_task`` separately.
+    """
+    task_lower = task_description.lower()
+    return _config_name_for_task(task_lower), COMMON_SCHEMAS[schema_name_for_task(task_lower)]
+
+@functools.lru_cache(maxsize=None)
+def _default_manager() -> ConfigManager:
+    """Shared manager for the default config directory, created on first use."""
+    return ConfigManager()
+
+def get_recommended_config(task_description: str) -> Mapping[str, Any]:
     """Get recommended configuration for a task description."""
-    manager = ConfigManager()
+    manager = _default_manager()
     config_name = manager.optimize_config_for_task(task_description)
     return manager.get_config(config_name)
 
-def merge_configs(base_config: Dict[str, Any], override_config: Dict[str, Any]) -> Dict[str, Any]:
-    """Merge two configurations with override taking precedence."""
-    result = base_config.copy()
+def merge_configs(base_config: Mapping[str, Any], override_config: Mapping[str, Any]) -> Dict[str, Any]:
+    """Merge two configurations with override taking precedence.
+    
+    The base is copied once up front and nested sections are then merged in
+    place from a worklist, so deep configs need no recursion.
+    """
+    result = thaw(base_config)
+    pending = deque([(result, override_config)])
     
-    for key, value in override_config.items():
-        if key in result and isinstance(value, dict) and isinstance(result[key], dict):
-            result[key] = merge_configs(result[key], value)
-        else:
-            result[key] = value
+    while pending:
+        target, source = pending.popleft()
+        for key, value in source.items():
+            if isinstance(value, Mapping) and isinstance(target.get(key), dict):
+                pending.append((target[key], value))
+            else:
+                target[key] = thaw(value)
     
     return result
\ No newline at end of file
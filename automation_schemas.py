@@ -1,10 +1,14 @@
 """Structured output schemas for browser automation tasks."""
 
-from typing import Dict, List, Optional, Any, Union
-from pydantic import BaseModel, Field
+import functools
+from collections.abc import Mapping
+from typing import Annotated, Dict, Iterator, List, Literal, Optional, Any, Tuple, Type, Union
+from pydantic import BaseModel, Field, TypeAdapter
 from enum import Enum
 from datetime import datetime
 
+from automation_utils import KeywordClassifier, freeze
+
 class ActionType(str, Enum):
     """Types of browser actions."""
     NAVIGATE = "navigate"
@@ -26,6 +30,7 @@ class DataExtractionSchema(BaseModel):
 
 class LoginResult(BaseModel):
     """Schema for login automation results."""
+    task_type: Literal["login"] = Field(default="login", description="Result kind tag")
     success: bool = Field(description="Whether login was successful")
     username: Optional[str] = Field(default=None, description="Username used for login")
     email: Optional[str] = Field(default=None, description="Email used for login")
@@ -36,6 +41,7 @@ class LoginResult(BaseModel):
 
 class FormFillResult(BaseModel):
     """Schema for form filling results."""
+    task_type: Literal["form"] = Field(default="form", description="Result kind tag")
     form_url: str = Field(description="URL of the form")
     fields_filled: List[str] = Field(description="List of field names that were filled")
     submission_successful: bool = Field(description="Whether form submission was successful")
@@ -44,6 +50,7 @@ class FormFillResult(BaseModel):
 
 class SearchResult(BaseModel):
     """Schema for search operation results."""
+    task_type: Literal["search"] = Field(default="search", description="Result kind tag")
     query: str = Field(description="Search query used")
     search_engine: str = Field(description="Search engine or site used")
     results_count: int = Field(description="Number of results found")
@@ -52,6 +59,7 @@ class SearchResult(BaseModel):
 
 class EcommerceActionResult(BaseModel):
     """Schema for e-commerce related actions."""
+    task_type: Literal["ecommerce"] = Field(default="ecommerce", description="Result kind tag")
     action_type: str = Field(description="Type of e-commerce action performed")
     product_info: Optional[Dict[str, Any]] = Field(default=None, description="Product information")
     cart_items: Optional[List[Dict[str, Any]]] = Field(default=None, description="Items in cart")
@@ -61,6 +69,7 @@ class EcommerceActionResult(BaseModel):
 
 class SocialMediaResult(BaseModel):
     """Schema for social media automation results."""
+    task_type: Literal["social_media"] = Field(default="social_media", description="Result kind tag")
     platform: str = Field(description="Social media platform")
     action: str = Field(description="Action performed (post, like, follow, etc.)")
     content: Optional[str] = Field(default=None, description="Content posted or interacted with")
@@ -69,6 +78,7 @@ class SocialMediaResult(BaseModel):
 
 class WebScrapingResult(BaseModel):
     """Schema for web scraping results."""
+    task_type: Literal["scraping"] = Field(default="scraping", description="Result kind tag")
     target_url: str = Field(description="URL that was scraped")
     data_points: int = Field(description="Number of data points extracted")
     structured_data: Dict[str, Any] = Field(description="Scraped data in structured format")
@@ -77,6 +87,7 @@ class WebScrapingResult(BaseModel):
 
 class FileOperationResult(BaseModel):
     """Schema for file operation results."""
+    task_type: Literal["file"] = Field(default="file", description="Result kind tag")
     operation: str = Field(description="Type of file operation (download, upload, read)")
     file_path: str = Field(description="Path to the file")
     file_size: Optional[int] = Field(default=None, description="File size in bytes")
@@ -86,96 +97,158 @@ class FileOperationResult(BaseModel):
 
 class NavigationResult(BaseModel):
     """Schema for navigation results."""
+    task_type: Literal["navigation"] = Field(default="navigation", description="Result kind tag")
     start_url: str = Field(description="Starting URL")
     end_url: str = Field(description="Final URL reached")
     pages_visited: List[str] = Field(description="List of URLs visited during navigation")
     navigation_time: float = Field(description="Total navigation time in seconds")
     success: bool = Field(description="Whether navigation was successful")
 
+# Any specific result, validated by looking up its task_type tag instead of
+# trying each model in turn
+TaskResult = Annotated[
+    Union[
+        LoginResult,
+        FormFillResult,
+        SearchResult,
+        EcommerceActionResult,
+        SocialMediaResult,
+        WebScrapingResult,
+        FileOperationResult,
+        NavigationResult,
+    ],
+    Field(discriminator="task_type"),
+]
+
+# Specific result models by their task_type tag
+RESULT_MODELS: Dict[str, Type[BaseModel]] = {
+    "login": LoginResult,
+    "form": FormFillResult,
+    "search": SearchResult,
+    "ecommerce": EcommerceActionResult,
+    "social_media": SocialMediaResult,
+    "scraping": WebScrapingResult,
+    "file": FileOperationResult,
+    "navigation": NavigationResult
+}
+
+def make_result(kind: str, validate: bool = False, **fields: Any) -> BaseModel:
+    """Create a specific result model by its task_type tag.
+    
+    Results produced by our own code are trusted, so by default they are
+    built with ``model_construct`` and skip validation entirely; pass
+    ``validate=True`` for data from untrusted sources such as agent output.
+    """
+    model = RESULT_MODELS[kind]
+    if validate:
+        return model.model_validate({**fields, "task_type": kind})
+    return model.model_construct(task_type=kind, **fields)
+
 class ComprehensiveAutomationResult(BaseModel):
     """Comprehensive schema that can handle multiple types of automation results."""
     task_type: str = Field(description="Type of automation task performed")
     success: bool = Field(description="Overall success of the task")
     duration: float = Field(description="Task duration in seconds")
     
-    # Optional specific results based on task type
-    login_result: Optional[LoginResult] = None
-    form_result: Optional[FormFillResult] = None
-    search_result: Optional[SearchResult] = None
-    ecommerce_result: Optional[EcommerceActionResult] = None
-    social_media_result: Optional[SocialMediaResult] = None
-    scraping_result: Optional[WebScrapingResult] = None
-    file_result: Optional[FileOperationResult] = None
-    navigation_result: Optional[NavigationResult] = None
+    # Specific result for the task type, dispatched on its task_type tag
+    result: Optional[TaskResult] = None
     
     # General fields
     extracted_data: Optional[Dict[str, Any]] = Field(default=None, description="Any additional extracted data")
     screenshots: Optional[List[str]] = Field(default=None, description="Paths to screenshots taken")
     errors: Optional[List[str]] = Field(default=None, description="Any errors encountered")
     recommendations: Optional[List[str]] = Field(default=None, description="Recommendations for improvement")
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
-# Predefined schemas for common automation tasks
-COMMON_SCHEMAS = {
-    "login_automation": LoginResult.model_json_schema(),
-    "form_filling": FormFillResult.model_json_schema(),
-    "web_search": SearchResult.model_json_schema(),
-    "ecommerce_automation": EcommerceActionResult.model_json_schema(),
-    "social_media_automation": SocialMediaResult.model_json_schema(),
-    "web_scraping": WebScrapingResult.model_json_schema(),
-    "file_operations": FileOperationResult.model_json_schema(),
-    "navigation_task": NavigationResult.model_json_schema(),
-    "comprehensive_automation": ComprehensiveAutomationResult.model_json_schema(),
-    "data_extraction": DataExtractionSchema.model_json_schema()
+# Result models behind the predefined schemas for common automation tasks
+SCHEMA_MODELS: Dict[str, Type[BaseModel]] = {
+    "login_automation": LoginResult,
+    "form_filling": FormFillResult,
+    "web_search": SearchResult,
+    "ecommerce_automation": EcommerceActionResult,
+    "social_media_automation": SocialMediaResult,
+    "web_scraping": WebScrapingResult,
+    "file_operations": FileOperationResult,
+    "navigation_task": NavigationResult,
+    "comprehensive_automation": ComprehensiveAutomationResult,
+    "data_extraction": DataExtractionSchema
 }
 
-def get_schema_for_task(task_description: str) -> Optional[Dict[str, Any]]:
-    """Automatically select appropriate schema based on task description."""
-    task_lower = task_description.lower()
-    
-    # Login related keywords
-    if any(keyword in task_lower for keyword in ['login', 'sign in', 'authenticate', 'temp mail', 'temporary email']):
-        return COMMON_SCHEMAS["login_automation"]
-    
-    # Form filling keywords
-    elif any(keyword in task_lower for keyword in ['form', 'fill', 'submit', 'register', 'signup']):
-        return COMMON_SCHEMAS["form_filling"]
-    
-    # Search related keywords
-    elif any(keyword in task_lower for keyword in ['search', 'find', 'look for', 'google', 'bing']):
-        return COMMON_SCHEMAS["web_search"]
-    
-    # E-commerce keywords
-    elif any(keyword in task_lower for keyword in ['buy', 'purchase', 'cart', 'checkout', 'product', 'shop']):
-        return COMMON_SCHEMAS["ecommerce_automation"]
-    
-    # Social media keywords
-    elif any(keyword in task_lower for keyword in ['post', 'tweet', 'facebook', 'instagram', 'linkedin', 'social']):
-        return COMMON_SCHEMAS["social_media_automation"]
-    
-    # Web scraping keywords
-    elif any(keyword in task_lower for keyword in ['scrape', 'extract', 'collect data', 'harvest']):
-        return COMMON_SCHEMAS["web_scraping"]
+@functools.lru_cache(maxsize=None)
+def _adapter_for(name: str) -> TypeAdapter:
+    """Build the validator for a predefined schema's model once."""
+    return TypeAdapter(SCHEMA_MODELS[name])
+
+@functools.lru_cache(maxsize=None)
+def _schema_for(name: str) -> Mapping[str, Any]:
+    """Generate a model's JSON schema once and share it as a read-only view."""
+    return freeze(_adapter_for(name).json_schema())
+
+class _SchemaRegistry(Mapping):
+    """Read-only mapping that builds each schema on first access."""
     
-    # File operations keywords
-    elif any(keyword in task_lower for keyword in ['download', 'upload', 'file', 'document', 'pdf']):
-        return COMMON_SCHEMAS["file_operations"]
+    def __getitem__(self, name: str) -> Mapping[str, Any]:
+        if name not in SCHEMA_MODELS:
+            raise KeyError(name)
+        return _schema_for(name)
     
-    # Navigation keywords
-    elif any(keyword in task_lower for keyword in ['navigate', 'go to', 'visit', 'browse']):
-        return COMMON_SCHEMAS["navigation_task"]
+    def __iter__(self) -> Iterator[str]:
+        return iter(SCHEMA_MODELS)
     
+    def __len__(self) -> int:
+        return len(SCHEMA_MODELS)
+
+# Predefined schemas for common automation tasks
+COMMON_SCHEMAS: Mapping[str, Mapping[str, Any]] = _SchemaRegistry()
+
+# Task keywords per schema, checked in priority order
+_SCHEMA_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("login_automation", ("login", "sign in", "authenticate", "temp mail", "temporary email")),
+    ("form_filling", ("form", "fill", "submit", "register", "signup")),
+    ("web_search", ("search", "find", "look for", "google", "bing")),
+    ("ecommerce_automation", ("buy", "purchase", "cart", "checkout", "product", "shop")),
+    ("social_media_automation", ("post", "tweet", "facebook", "instagram", "linkedin", "social")),
+    ("web_scraping", ("scrape", "extract", "collect data", "harvest")),
+    ("file_operations", ("download", "upload", "file", "document", "pdf")),
+    ("navigation_task", ("navigate", "go to", "visit", "browse")),
+)
+
+_SCHEMA_CLASSIFIER = KeywordClassifier(_SCHEMA_KEYWORDS)
+
+def schema_name_for_task(task_lower: str) -> str:
+    """Pick the schema name for an already lowercased task description."""
     # Default to comprehensive schema for complex tasks
-    else:
-        return COMMON_SCHEMAS["comprehensive_automation"]
+    return _SCHEMA_CLASSIFIER.classify(task_lower, "comprehensive_automation")
+
+def get_schema_for_task(task_description: str) -> Optional[Mapping[str, Any]]:
+    """Automatically select appropriate schema based on task description."""
+    return _schema_for(schema_name_for_task(task_description.lower()))
 
-def create_custom_schema(fields: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+def get_validator_for_task(task_description: str) -> TypeAdapter:
+    """Get a cached validator for the schema ``get_schema_for_task`` selects.
+    
+    Use ``validate_json`` on raw agent output to parse and validate it in one
+    step without going through ``json.loads`` first.
+    """
+    return _adapter_for(schema_name_for_task(task_description.lower()))
+
+@functools.lru_cache(maxsize=128)
+def _custom_schema(fields: Tuple[Tuple[str, Any, str, bool], ...]) -> Mapping[str, Any]:
+    """Build and freeze a custom schema from normalized field definitions."""
+    return freeze({
+        "type": "object",
+        "properties": {
+            name: {"type": field_type, "description": description}
+            for name, field_type, description, _ in fields
+        },
+        "required": [name for name, _, _, required in fields if required]
+    })
+
+def create_custom_schema(fields: Dict[str, Dict[str, Any]]) -> Mapping[str, Any]:
     """Create a custom schema dynamically.
     
+    Schemas are cached by their field definitions and returned as shared
+    read-only views, so repeated requests for the same shape are cheap.
+    
     Args:
         fields: Dictionary where keys are field names and values are field definitions
                 Example: {
@@ -183,20 +256,8 @@ def create_custom_schema(fields: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
                     "price": {"type": "number", "description": "Product price"}
                 }
     """
-    properties = {}
-    required = []
-    
-    for field_name, field_def in fields.items():
-        properties[field_name] = {
-            "type": field_def.get("type", "string"),
-            "description": field_def.get("description", "")
-        }
-        
-        if field_def.get("required", False):
-            required.append(field_name)
-    
-    return {
-        "type": "object",
-        "properties": properties,
-        "required": required
-    }
\ No newline at end of file
+    return _custom_schema(tuple(
+        (name, freeze(field_def.get("type", "string")), field_def.get("description", ""),
+         bool(field_def.get("required", False)))
+        for name, field_def in fields.items()
+    ))
\ No newline at end of file
@@ -1,17 +1,28 @@
 """Utility functions and enhanced error handling for browser automation."""
 
 import asyncio
+import math
+import os
+import re
+import sqlite3
+import sys
+import threading
 import time
 import random
-from typing import Dict, List, Optional, Any, Callable, Tuple
-from functools import wraps
+from typing import Dict, Iterable, List, Optional, Any, Callable, Tuple
+from collections import OrderedDict
+from collections.abc import Mapping
+from functools import cached_property, wraps
 import logging
 from datetime import datetime, timedelta
-import json
 from pathlib import Path
 import hashlib
 from dataclasses import dataclass
 from enum import Enum
+from types import MappingProxyType
+from urllib.parse import urlparse
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +64,15 @@ class NetworkError(AutomationError):
     """Network-related errors."""
     pass
 
+def _fibonacci_table(length: int) -> Tuple[int, ...]:
+    sequence = [1, 1]
+    while len(sequence) < length:
+        sequence.append(sequence[-1] + sequence[-2])
+    return tuple(sequence)
+
+# Fibonacci multipliers by attempt; far beyond any realistic retry count
+_FIBONACCI = _fibonacci_table(64)
+
 def calculate_retry_delay(attempt: int, config: RetryConfig) -> float:
     """Calculate delay for retry attempt based on strategy."""
     if config.strategy == RetryStrategy.LINEAR:
@@ -60,10 +80,7 @@ def calculate_retry_delay(attempt: int, config: RetryConfig) -> float:
     elif config.strategy == RetryStrategy.EXPONENTIAL:
         delay = config.base_delay * (config.backoff_multiplier ** (attempt - 1))
     elif config.strategy == RetryStrategy.FIBONACCI:
-        fib_sequence = [1, 1]
-        for i in range(2, attempt + 1):
-            fib_sequence.append(fib_sequence[i-1] + fib_sequence[i-2])
-        delay = config.base_delay * fib_sequence[min(attempt, len(fib_sequence) - 1)]
+        delay = config.base_delay * _FIBONACCI[min(attempt, len(_FIBONACCI) - 1)]
     elif config.strategy == RetryStrategy.RANDOM:
         delay = random.uniform(config.base_delay, config.base_delay * 3)
     else:
@@ -76,184 +93,243 @@ def calculate_retry_delay(attempt: int, config: RetryConfig) -> float:
     
     return min(delay, config.max_delay)
 
-def retry_async(config: RetryConfig):
-    """Decorator for async functions with retry logic."""
+def retry(config: RetryConfig):
+    """Decorator adding retry logic to sync or async functions.
+    
+    Coroutine functions get a wrapper that waits with ``asyncio.sleep`` so
+    retries never block the event loop; plain functions use ``time.sleep``.
+    """
     def decorator(func):
+        # Bound once so the retry loop only reads locals
+        max_attempts = config.max_attempts
+        retry_on = tuple(config.retry_on_exceptions)
+        func_name = func.__name__
+        
         @wraps(func)
-        async def wrapper(*args, **kwargs):
-            last_exception = None
-            
-            for attempt in range(1, config.max_attempts + 1):
+        async def async_wrapper(*args, **kwargs):
+            for attempt in range(1, max_attempts + 1):
                 try:
                     return await func(*args, **kwargs)
-                except config.retry_on_exceptions as e:
-                    last_exception = e
-                    
-                    if attempt == config.max_attempts:
-                        logger.error(f"Function {func.__name__} failed after {config.max_attempts} attempts: {e}")
-                        raise e
+                except retry_on as e:
+                    if attempt == max_attempts:
+                        logger.error(f"Function {func_name} failed after {max_attempts} attempts: {e}")
+                        raise
                     
                     delay = calculate_retry_delay(attempt, config)
-                    logger.warning(f"Attempt {attempt} failed for {func.__name__}: {e}. Retrying in {delay:.2f}s")
+                    logger.warning(f"Attempt {attempt} failed for {func_name}: {e}. Retrying in {delay:.2f}s")
                     await asyncio.sleep(delay)
-            
-            raise last_exception
-        return wrapper
-    return decorator
-
-def retry_sync(config: RetryConfig):
-    """Decorator for sync functions with retry logic."""
-    def decorator(func):
+        
         @wraps(func)
-        def wrapper(*args, **kwargs):
-            last_exception = None
-            
-            for attempt in range(1, config.max_attempts + 1):
+        def sync_wrapper(*args, **kwargs):
+            for attempt in range(1, max_attempts + 1):
                 try:
                     return func(*args, **kwargs)
-                except config.retry_on_exceptions as e:
-                    last_exception = e
-                    
-                    if attempt == config.max_attempts:
-                        logger.error(f"Function {func.__name__} failed after {config.max_attempts} attempts: {e}")
-                        raise e
+                except retry_on as e:
+                    if attempt == max_attempts:
+                        logger.error(f"Function {func_name} failed after {max_attempts} attempts: {e}")
+                        raise
                     
                     delay = calculate_retry_delay(attempt, config)
-                    logger.warning(f"Attempt {attempt} failed for {func.__name__}: {e}. Retrying in {delay:.2f}s")
+                    logger.warning(f"Attempt {attempt} failed for {func_name}: {e}. Retrying in {delay:.2f}s")
                     time.sleep(delay)
-            
-            raise last_exception
-        return wrapper
+        
+        if asyncio.iscoroutinefunction(func):
+            return async_wrapper
+        else:
+            return sync_wrapper
     return decorator
 
+# Kept for existing callers; both pick the right wrapper for the function
+retry_async = retry
+retry_sync = retry
+
+@dataclass(slots=True)
+class FunctionStats:
+    """Call counts and streaming execution time statistics for one function.
+    
+    Execution times use Welford's algorithm, so memory stays constant
+    however many executions are recorded.
+    """
+    calls: int = 0
+    errors: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+    
+    def add(self, duration: float, success: bool):
+        """Fold one execution into the running statistics."""
+        self.calls += 1
+        if not success:
+            self.errors += 1
+        
+        delta = duration - self.mean
+        self.mean += delta / self.calls
+        self.m2 += delta * (duration - self.mean)
+        if duration < self.min:
+            self.min = duration
+        if duration > self.max:
+            self.max = duration
+    
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.m2 / self.calls) if self.calls else 0.0
+
 class PerformanceMonitor:
     """Monitor and track performance metrics."""
     
     def __init__(self):
-        self.metrics = {
-            'function_calls': {},
-            'execution_times': {},
-            'error_counts': {},
-            'success_rates': {}
-        }
+        self.stats: Dict[str, FunctionStats] = {}
     
     def track_execution(self, func_name: str, duration: float, success: bool):
         """Track function execution metrics."""
-        if func_name not in self.metrics['function_calls']:
-            self.metrics['function_calls'][func_name] = 0
-            self.metrics['execution_times'][func_name] = []
-            self.metrics['error_counts'][func_name] = 0
-            self.metrics['success_rates'][func_name] = {'success': 0, 'total': 0}
-        
-        self.metrics['function_calls'][func_name] += 1
-        self.metrics['execution_times'][func_name].append(duration)
-        self.metrics['success_rates'][func_name]['total'] += 1
-        
-        if success:
-            self.metrics['success_rates'][func_name]['success'] += 1
-        else:
-            self.metrics['error_counts'][func_name] += 1
+        stats = self.stats.get(func_name)
+        if stats is None:
+            stats = self.stats[func_name] = FunctionStats()
+        stats.add(duration, success)
     
     def get_stats(self, func_name: Optional[str] = None) -> Dict[str, Any]:
         """Get performance statistics."""
         if func_name:
-            if func_name not in self.metrics['function_calls']:
+            stats = self.stats.get(func_name)
+            if stats is None:
                 return {}
             
-            times = self.metrics['execution_times'][func_name]
-            success_data = self.metrics['success_rates'][func_name]
-            
             return {
                 'function_name': func_name,
-                'total_calls': self.metrics['function_calls'][func_name],
-                'error_count': self.metrics['error_counts'][func_name],
-                'success_rate': success_data['success'] / success_data['total'] if success_data['total'] > 0 else 0,
-                'avg_execution_time': sum(times) / len(times) if times else 0,
-                'min_execution_time': min(times) if times else 0,
-                'max_execution_time': max(times) if times else 0
+                'total_calls': stats.calls,
+                'error_count': stats.errors,
+                'success_rate': (stats.calls - stats.errors) / stats.calls if stats.calls else 0,
+                'avg_execution_time': stats.mean,
+                'min_execution_time': stats.min if stats.calls else 0,
+                'max_execution_time': stats.max if stats.calls else 0,
+                'stddev_execution_time': stats.stddev
             }
         else:
             # Return overall stats
-            all_stats = {}
-            for func in self.metrics['function_calls'].keys():
-                all_stats[func] = self.get_stats(func)
-            return all_stats
+            return {func: self.get_stats(func) for func in self.stats}
 
 # Global performance monitor instance
 performance_monitor = PerformanceMonitor()
 
-def monitor_performance(func):
+def monitor_performance(func: Callable) -> Callable:
     """Decorator to monitor function performance."""
+    # Resolved once here rather than on every call of the wrapped function
+    func_name: str = func.__name__
+    track_execution = performance_monitor.track_execution
+    
     @wraps(func)
     async def async_wrapper(*args, **kwargs):
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         success = False
         try:
             result = await func(*args, **kwargs)
             success = True
             return result
-        except Exception as e:
-            raise e
         finally:
-            duration = time.time() - start_time
-            performance_monitor.track_execution(func.__name__, duration, success)
+            track_execution(func_name, (time.perf_counter_ns() - start_time) * 1e-9, success)
     
     @wraps(func)
     def sync_wrapper(*args, **kwargs):
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         success = False
         try:
             result = func(*args, **kwargs)
             success = True
             return result
-        except Exception as e:
-            raise e
         finally:
-            duration = time.time() - start_time
-            performance_monitor.track_execution(func.__name__, duration, success)
+            track_execution(func_name, (time.perf_counter_ns() - start_time) * 1e-9, success)
     
     if asyncio.iscoroutinefunction(func):
         return async_wrapper
     else:
         return sync_wrapper
 
+# Entry files written by the old file-based cache: an MD5 key plus ".json"
+_LEGACY_CACHE_FILE_RE = re.compile(r'^[0-9a-f]{32}\.json$')
+
 class TaskCache:
-    """Cache for automation task results."""
+    """Cache for automation task results.
     
-    def __init__(self, cache_dir: Optional[str] = None, ttl_hours: int = 24):
+    Entries live in a single SQLite database indexed by expiry time, so
+    expiring old results is one DELETE instead of opening every entry. The
+    most recently used entries are also kept in memory so hot lookups never
+    touch the database.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None, ttl_hours: int = 24, memory_size: int = 1024):
         self.cache_dir = Path(cache_dir) if cache_dir else Path("./cache")
         self.cache_dir.mkdir(exist_ok=True)
         self.ttl = timedelta(hours=ttl_hours)
+        self._ttl_seconds = ttl_hours * 3600.0
+        
+        self._lock = threading.Lock()
+        # cache key -> (expires_at, result), least recently used first
+        self._memory_size = memory_size
+        self._memory: OrderedDict[str, Tuple[float, Dict[str, Any]]] = OrderedDict()
+    
+    def _remember(self, cache_key: str, expires_at: float, result: Dict[str, Any]):
+        """Store an entry in the in-memory layer, evicting the least recently used."""
+        if not self._memory_size:
+            return
+        
+        self._memory[cache_key] = (expires_at, result)
+        self._memory.move_to_end(cache_key)
+        if len(self._memory) > self._memory_size:
+            self._memory.popitem(last=False)
+    
+    @cached_property
+    def _db(self) -> sqlite3.Connection:
+        """Open the cache database on first use."""
+        db = sqlite3.connect(self.cache_dir / "cache.db", check_same_thread=False)
+        with db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, payload BLOB NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at)")
+        return db
     
     def _get_cache_key(self, task_description: str, config: Dict[str, Any]) -> str:
         """Generate cache key for task and config."""
-        combined = f"{task_description}_{json.dumps(config, sort_keys=True)}"
-        return hashlib.md5(combined.encode()).hexdigest()
-    
-    def _get_cache_file(self, cache_key: str) -> Path:
-        """Get cache file path for key."""
-        return self.cache_dir / f"{cache_key}.json"
+        key = hashlib.blake2b(task_description.encode(), digest_size=16)
+        key.update(b"\0")
+        key.update(orjson.dumps(config, default=json_default, option=orjson.OPT_SORT_KEYS))
+        return key.hexdigest()
     
     def get(self, task_description: str, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Get cached result if available and not expired."""
         cache_key = self._get_cache_key(task_description, config)
-        cache_file = self._get_cache_file(cache_key)
         
-        if not cache_file.exists():
-            return None
+        now = time.time()
         
         try:
-            with open(cache_file, 'r') as f:
-                cached_data = json.load(f)
-            
-            # Check if cache is expired
-            cached_time = datetime.fromisoformat(cached_data['timestamp'])
-            if datetime.now() - cached_time > self.ttl:
-                cache_file.unlink()  # Remove expired cache
-                return None
+            with self._lock:
+                entry = self._memory.get(cache_key)
+                if entry is not None:
+                    if entry[0] >= now:
+                        self._memory.move_to_end(cache_key)
+                        logger.info(f"Cache hit for task: {task_description[:50]}...")
+                        return entry[1]
+                    del self._memory[cache_key]
+                
+                row = self._db.execute(
+                    "SELECT expires_at, payload FROM entries WHERE key = ?", (cache_key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                
+                # Check if cache is expired
+                if row[0] < now:
+                    with self._db:
+                        self._db.execute("DELETE FROM entries WHERE key = ?", (cache_key,))
+                    return None
+                
+                result = orjson.loads(row[1])['result']
+                self._remember(cache_key, row[0], result)
             
             logger.info(f"Cache hit for task: {task_description[:50]}...")
-            return cached_data['result']
+            return result
         
         except Exception as e:
             logger.warning(f"Error reading cache: {e}")
@@ -262,48 +338,86 @@ class TaskCache:
     def set(self, task_description: str, config: Dict[str, Any], result: Dict[str, Any]):
         """Cache task result."""
         cache_key = self._get_cache_key(task_description, config)
-        cache_file = self._get_cache_file(cache_key)
+        now = time.time()
         
         cached_data = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now,
             'task_description': task_description,
             'config': config,
             'result': result
         }
         
         try:
-            with open(cache_file, 'w') as f:
-                json.dump(cached_data, f, indent=2, default=str)
+            payload = orjson.dumps(cached_data, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+            expires_at = now + self._ttl_seconds
+            with self._lock, self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries (key, expires_at, payload) VALUES (?, ?, ?)",
+                    (cache_key, expires_at, payload)
+                )
+                self._remember(cache_key, expires_at, result)
             logger.info(f"Cached result for task: {task_description[:50]}...")
         except Exception as e:
             logger.warning(f"Error writing cache: {e}")
     
     def clear_expired(self):
         """Clear all expired cache entries."""
-        cleared_count = 0
-        for cache_file in self.cache_dir.glob("*.json"):
-            try:
-                with open(cache_file, 'r') as f:
-                    cached_data = json.load(f)
-                
-                cached_time = datetime.fromisoformat(cached_data['timestamp'])
-                if datetime.now() - cached_time > self.ttl:
-                    cache_file.unlink()
-                    cleared_count += 1
-            except Exception:
-                # Remove corrupted cache files
-                cache_file.unlink()
-                cleared_count += 1
+        now = time.time()
+        with self._lock, self._db:
+            cleared_count = self._db.execute(
+                "DELETE FROM entries WHERE expires_at < ?", (now,)
+            ).rowcount
+            for cache_key in [key for key, (expires_at, _) in self._memory.items() if expires_at < now]:
+                del self._memory[cache_key]
         
         logger.info(f"Cleared {cleared_count} expired cache entries")
+        self._remove_legacy_files()
     
     def clear_all(self):
         """Clear all cache entries."""
-        cleared_count = 0
-        for cache_file in self.cache_dir.glob("*.json"):
-            cache_file.unlink()
-            cleared_count += 1
+        with self._lock, self._db:
+            cleared_count = self._db.execute("DELETE FROM entries").rowcount
+            self._memory.clear()
         logger.info(f"Cleared all {cleared_count} cache entries")
+        self._remove_legacy_files()
+    
+    def _remove_legacy_files(self) -> int:
+        """Delete per-entry JSON files left by the old file-based cache.
+        
+        They are never read any more, so they are swept by name from a
+        directory scan without being opened. Only names in the old key
+        format are touched, since ``cache_dir`` may hold other files.
+        """
+        removed = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if _LEGACY_CACHE_FILE_RE.match(entry.name) and entry.is_file():
+                    try:
+                        os.unlink(entry.path)
+                        removed += 1
+                    except FileNotFoundError:
+                        pass
+        if removed:
+            logger.info(f"Removed {removed} legacy cache files")
+        return removed
+    
+    def close(self):
+        """Close the underlying database if it was opened."""
+        with self._lock:
+            db = self.__dict__.pop('_db', None)
+            if db is not None:
+                db.close()
+
+_URL_RE = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+'  # domain...
+    r'(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'  # host...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_INVALID_FILENAME_CHARS = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
 
 class ValidationUtils:
     """Utilities for validating automation results."""
@@ -311,40 +425,27 @@ class ValidationUtils:
     @staticmethod
     def validate_url(url: str) -> bool:
         """Validate if URL is properly formatted."""
-        import re
-        url_pattern = re.compile(
-            r'^https?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+'  # domain...
-            r'(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'  # host...
-            r'localhost|'  # localhost...
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-            r'(?::\d+)?'  # optional port
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-        return url_pattern.match(url) is not None
+        # Cheap scheme check first so most non-URLs never reach the regex
+        if not url[:8].lower().startswith(('http://', 'https://')):
+            return False
+        return _URL_RE.match(url) is not None
     
     @staticmethod
     def validate_email(email: str) -> bool:
         """Validate email format."""
-        import re
-        email_pattern = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
-        return email_pattern.match(email) is not None
+        return _EMAIL_RE.match(email) is not None
     
     @staticmethod
     def validate_task_result(result: Dict[str, Any], required_fields: List[str]) -> Tuple[bool, List[str]]:
         """Validate that task result contains required fields."""
-        missing_fields = []
-        for field in required_fields:
-            if field not in result or result[field] is None:
-                missing_fields.append(field)
-        
-        return len(missing_fields) == 0, missing_fields
+        missing_fields = [field for field in required_fields if result.get(field) is None]
+        return not missing_fields, missing_fields
     
     @staticmethod
     def sanitize_filename(filename: str) -> str:
         """Sanitize filename for safe file operations."""
-        import re
         # Remove or replace invalid characters
-        sanitized = re.sub(r'[<>:"/\\|?*]', '_', filename)
+        sanitized = filename.translate(_INVALID_FILENAME_CHARS)
         # Remove leading/trailing spaces and dots
         sanitized = sanitized.strip(' .')
         # Limit length
@@ -361,10 +462,8 @@ class HumanBehaviorSimulator:
     @staticmethod
     def typing_delay(text_length: int, wpm: int = 60) -> float:
         """Calculate realistic typing delay based on text length and WPM."""
-        # Average 5 characters per word
-        words = text_length / 5
-        minutes = words / wpm
-        seconds = minutes * 60
+        # Average 5 characters per word: (length / 5) words / wpm minutes * 60
+        seconds = text_length * 12.0 / wpm
         # Add some randomness
         return seconds * random.uniform(0.8, 1.2)
     
@@ -380,18 +479,34 @@ class HumanBehaviorSimulator:
         """Generate realistic break duration."""
         return random.uniform(2.0, 8.0)
 
+_TEMP_EMAIL_DOMAINS = ('tempmail.org', '10minutemail.com', 'guerrillamail.com', 'mailinator.com')
+_TEMP_EMAIL_ALPHABET = 'abcdefghijklmnopqrstuvwxyz0123456789'
+
 def generate_temp_email() -> str:
     """Generate a temporary email address."""
-    domains = ['tempmail.org', '10minutemail.com', 'guerrillamail.com', 'mailinator.com']
-    username = ''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=8))
-    domain = random.choice(domains)
+    username = ''.join(random.choices(_TEMP_EMAIL_ALPHABET, k=8))
+    domain = random.choice(_TEMP_EMAIL_DOMAINS)
     return f"{username}@{domain}"
 
+# scheme://netloc/path with no params, stopping at the query or fragment
+_URL_PARTS_RE = re.compile(r'[A-Za-z][A-Za-z0-9+.-]*://([^/?#\t\r\n]*)([^?#;\t\r\n]*)(?=[?#]|\Z)')
+
+def _split_url(url: str) -> Tuple[str, str]:
+    """Return the (netloc, path) of a URL.
+    
+    Plain ``scheme://host/path`` URLs are split with one regex match; any
+    other shape falls back to ``urlparse``.
+    """
+    match = _URL_PARTS_RE.match(url)
+    if match is not None:
+        return match.group(1), match.group(2)
+    
+    parsed = urlparse(url)
+    return parsed.netloc, parsed.path
+
 def extract_domain(url: str) -> str:
     """Extract domain from URL."""
-    from urllib.parse import urlparse
-    parsed = urlparse(url)
-    return parsed.netloc
+    return _split_url(url)[0]
 
 def format_duration(seconds: float) -> str:
     """Format duration in human-readable format."""
@@ -404,12 +519,95 @@ def format_duration(seconds: float) -> str:
         hours = seconds / 3600
         return f"{hours:.1f}h"
 
+class KeywordClassifier:
+    """Priority-ordered keyword classifier backed by one compiled regex.
+    
+    Returns the first category (in declaration order) that has any of its
+    keywords as a substring of the text -- the same answer as a chain of
+    ``any(keyword in text for keyword in ...)`` checks, found in a single
+    C-level scan instead of one Python-level substring search per keyword.
+    """
+    
+    def __init__(self, categories: Iterable[Tuple[str, Iterable[str]]]):
+        self.categories = tuple(
+            (sys.intern(name), tuple(sys.intern(keyword) for keyword in keywords))
+            for name, keywords in categories
+        )
+        
+        # A zero-width lookahead reports a match at every position, and the
+        # alternation order makes the highest-priority keyword win per position
+        alternation = "|".join(
+            f"({'|'.join(map(re.escape, keywords))})" for _, keywords in self.categories
+        )
+        self._pattern = re.compile(f"(?=(?:{alternation}))")
+        
+        # Regex group number -> category; group N holds the N-th category's
+        # keywords, so the lowest group number seen is the winner
+        self._group_categories = (None,) + tuple(name for name, _ in self.categories)
+    
+    def classify(self, text: str, default: Optional[str] = None) -> Optional[str]:
+        """Return the highest-priority category matching ``text``."""
+        best = None
+        for match in self._pattern.finditer(text):
+            group = match.lastindex
+            if best is None or group < best:
+                best = group
+                if best == 1:
+                    break
+        
+        return default if best is None else self._group_categories[best]
+
+def freeze(value: Any, _memo: Optional[Dict[int, Any]] = None) -> Any:
+    """Recursively turn dicts into read-only views and lists into tuples.
+    
+    A dict or list referenced from several places is frozen once and the
+    resulting view is shared by all of them.
+    """
+    if not isinstance(value, (Mapping, list)):
+        return value
+    
+    if _memo is None:
+        _memo = {}
+    frozen = _memo.get(id(value))
+    if frozen is None:
+        if isinstance(value, Mapping):
+            frozen = MappingProxyType({key: freeze(item, _memo) for key, item in value.items()})
+        else:
+            frozen = tuple(freeze(item, _memo) for item in value)
+        _memo[id(value)] = frozen
+    return frozen
+
+def thaw(value: Any) -> Any:
+    """Recursively turn frozen views back into plain dicts and lists."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+def json_default(obj: Any) -> Any:
+    """``default`` hook for json/orjson that serializes frozen mappings."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    return str(obj)
+
+def write_json_report(filepath: str, report: Dict[str, Any]):
+    """Serialize and write a JSON report.
+    
+    Runs on a worker thread, off the event loop. The report is written to a
+    temporary file and renamed into place, so readers never see it half
+    written.
+    """
+    tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(report, default=str, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, filepath)
+
 def safe_filename_from_url(url: str) -> str:
     """Generate safe filename from URL."""
-    from urllib.parse import urlparse
-    parsed = urlparse(url)
-    domain = parsed.netloc.replace('.', '_')
-    path = parsed.path.replace('/', '_').replace('\\', '_')
+    netloc, path = _split_url(url)
+    domain = netloc.replace('.', '_')
+    path = path.replace('/', '_').replace('\\', '_')
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     return f"{domain}{path}_{timestamp}"
 
@@ -426,16 +624,13 @@ class ErrorAnalyzer:
         'validation': ['invalid', 'required field', 'format', 'validation']
     }
     
+    # Categories are checked in ERROR_CATEGORIES order in a single scan
+    _CLASSIFIER = KeywordClassifier(ERROR_CATEGORIES.items())
+    
     @classmethod
     def categorize_error(cls, error_message: str) -> str:
         """Categorize error based on message content."""
-        error_lower = error_message.lower()
-        
-        for category, keywords in cls.ERROR_CATEGORIES.items():
-            if any(keyword in error_lower for keyword in keywords):
-                return category
-        
-        return 'unknown'
+        return cls._CLASSIFIER.classify(error_message.lower(), 'unknown')
     
     @classmethod
     def suggest_solution(cls, error_message: str) -> str:
@@ -1,30 +1,39 @@
 """Multi-language code generators for browser automation tasks."""
 
+import functools
 import json
 import re
-from typing import Dict, List, Optional, Any, Tuple
+import time
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, ClassVar, Dict, List, NamedTuple, Optional, Any, Tuple
 from datetime import datetime
 from pathlib import Path
-from jinja2 import Environment, BaseLoader, Template
 from automation_schemas import get_schema_for_task
 from automation_configs import get_recommended_config
+from automation_utils import freeze
+
+if TYPE_CHECKING:
+    from jinja2 import Environment, Template
 
 class CodeGeneratorManager:
     """Manages code generation for multiple programming languages."""
     
     def __init__(self):
-        self.generators = {
-            'python': PythonGenerator(),
-            'javascript': JavaScriptGenerator(),
-            'typescript': TypeScriptGenerator(),
-            'java': JavaGenerator(),
-            'csharp': CSharpGenerator(),
-            'go': GoGenerator(),
-            'rust': RustGenerator(),
-            'php': PHPGenerator(),
-            'ruby': RubyGenerator(),
-            'kotlin': KotlinGenerator()
-        }
+        # Generators are built on first use; most callers only need one language
+        self._generators: Dict[str, 'BaseGenerator'] = {}
+    
+    def _get(self, language: str) -> Optional['BaseGenerator']:
+        """Return the generator for ``language``, creating it on first use.
+        
+        Returns None if the language is not supported.
+        """
+        generator = self._generators.get(language)
+        if generator is None:
+            factory = _GENERATORS.get(language)
+            if factory is None:
+                return None
+            generator = self._generators[language] = factory()
+        return generator
     
     async def generate_code(self, 
                           task_description: str,
@@ -34,11 +43,10 @@ class CodeGeneratorManager:
                           include_docs: bool = True) -> Dict[str, Any]:
         """Generate code for automation task in specified language."""
         
-        if target_language.lower() not in self.generators:
+        generator = self._get(target_language.lower())
+        if generator is None:
             raise ValueError(f"Unsupported language: {target_language}")
         
-        generator = self.generators[target_language.lower()]
-        
         # Get task analysis
         task_analysis = self._analyze_task(task_description)
         
@@ -53,72 +61,143 @@ class CodeGeneratorManager:
         
         return result
     
-    def get_supported_languages(self) -> Dict[str, Dict[str, Any]]:
+    @property
+    def supported_languages(self) -> Mapping[str, Mapping[str, Any]]:
+        """Read-only view of supported languages and their capabilities."""
+        return _SUPPORTED_LANGUAGES
+    
+    def get_supported_languages(self) -> Mapping[str, Mapping[str, Any]]:
         """Get list of supported languages and their capabilities."""
-        languages = {}
-        for lang, generator in self.generators.items():
-            languages[lang] = {
-                'name': generator.get_language_name(),
-                'frameworks': generator.get_supported_frameworks(),
-                'features': generator.get_features(),
-                'file_extensions': generator.get_file_extensions()
-            }
-        return languages
+        return self.supported_languages
     
-    def _analyze_task(self, task_description: str) -> Dict[str, Any]:
+    def _analyze_task(self, task_description: str) -> 'TaskAnalysis':
         """Analyze task description to extract key information."""
-        task_lower = task_description.lower()
-        
-        # Detect task type
-        task_type = 'general'
-        if any(keyword in task_lower for keyword in ['login', 'sign in', 'authenticate']):
-            task_type = 'login'
-        elif any(keyword in task_lower for keyword in ['form', 'fill', 'submit']):
-            task_type = 'form_filling'
-        elif any(keyword in task_lower for keyword in ['search', 'find', 'look for']):
-            task_type = 'search'
-        elif any(keyword in task_lower for keyword in ['scrape', 'extract', 'collect']):
-            task_type = 'scraping'
-        elif any(keyword in task_lower for keyword in ['buy', 'purchase', 'cart']):
-            task_type = 'ecommerce'
-        
-        # Extract URLs
-        url_pattern = r'https?://[^\s]+|www\.[^\s]+|[a-zA-Z0-9-]+\.[a-zA-Z]{2,}'
-        urls = re.findall(url_pattern, task_description)
-        
-        # Extract actions
-        actions = []
-        action_keywords = {
-            'navigate': ['go to', 'visit', 'navigate', 'open'],
-            'click': ['click', 'press', 'tap'],
-            'input': ['type', 'enter', 'input', 'fill'],
-            'wait': ['wait', 'pause', 'delay'],
-            'extract': ['extract', 'get', 'collect', 'scrape']
-        }
-        
-        for action, keywords in action_keywords.items():
-            if any(keyword in task_lower for keyword in keywords):
-                actions.append(action)
-        
-        return {
-            'type': task_type,
-            'urls': urls,
-            'actions': actions,
-            'complexity': len(actions),
-            'requires_auth': 'login' in task_type or any(keyword in task_lower for keyword in ['login', 'password', 'auth']),
-            'requires_data_extraction': 'extract' in actions or 'scraping' in task_type,
-            'requires_form_interaction': 'form_filling' in task_type or 'input' in actions
-        }
+        return analyze_task(task_description)
+
+_URL_RE = re.compile(r'https?://[^\s]+|www\.[^\s]+|[a-zA-Z0-9-]+\.[a-zA-Z]{2,}')
+
+# Checked in order; the first category with a matching keyword wins.
+_TASK_TYPE_KEYWORDS = (
+    ('login', ('login', 'sign in', 'authenticate')),
+    ('form_filling', ('form', 'fill', 'submit')),
+    ('search', ('search', 'find', 'look for')),
+    ('scraping', ('scrape', 'extract', 'collect')),
+    ('ecommerce', ('buy', 'purchase', 'cart')),
+)
+
+_ACTION_KEYWORDS = (
+    ('navigate', ('go to', 'visit', 'navigate', 'open')),
+    ('click', ('click', 'press', 'tap')),
+    ('input', ('type', 'enter', 'input', 'fill')),
+    ('wait', ('wait', 'pause', 'delay')),
+    ('extract', ('extract', 'get', 'collect', 'scrape')),
+)
+
+_AUTH_KEYWORDS = ('login', 'password', 'auth')
+
+def _build_keyword_labels(groups: Tuple[Tuple[str, Any], ...]) -> Tuple[Tuple[str, frozenset], ...]:
+    """Flatten keyword tables into unique ``(keyword, labels)`` pairs.
+    
+    Labels are ``(group, name)`` pairs; a keyword shared by several tables
+    (``'fill'``, ``'extract'``, ``'login'``, ...) is searched for only once.
+    """
+    labels_by_keyword: Dict[str, set] = {}
+    for group, table in groups:
+        for name, keywords in table:
+            for keyword in keywords:
+                labels_by_keyword.setdefault(keyword, set()).add((group, name))
+    return tuple((keyword, frozenset(labels)) for keyword, labels in labels_by_keyword.items())
+
+_KEYWORD_LABELS = _build_keyword_labels((
+    ('type', _TASK_TYPE_KEYWORDS),
+    ('action', _ACTION_KEYWORDS),
+    ('auth', (('auth', _AUTH_KEYWORDS),)),
+))
+
+class TaskAnalysis(NamedTuple):
+    """Key information extracted from a task description."""
+    type: str
+    urls: Tuple[str, ...]
+    actions: Tuple[str, ...]
+    complexity: int
+    requires_auth: bool
+    requires_data_extraction: bool
+    requires_form_interaction: bool
+
+@functools.lru_cache(maxsize=1024)
+def analyze_task(task_description: str) -> TaskAnalysis:
+    """Analyze task description to extract key information.
+    
+    Results are memoized per description; being tuples, they are immutable
+    and hashable, so derived output can be memoized on them too.
+    """
+    task_lower = task_description.lower()
+    
+    # Collect every keyword label present in the text; each substring test
+    # is a single C-level search, which beats a per-position regex scan
+    found = set()
+    for keyword, labels in _KEYWORD_LABELS:
+        if keyword in task_lower:
+            found |= labels
+    
+    # Detect task type
+    task_type = next(
+        (category for category, _ in _TASK_TYPE_KEYWORDS if ('type', category) in found),
+        'general'
+    )
+    
+    # Extract URLs; every form the pattern accepts contains '.' or '://', so
+    # skip the regex (which backtracks over long dot-less words) otherwise
+    if '.' in task_description or '://' in task_description:
+        urls = tuple(_URL_RE.findall(task_description))
+    else:
+        urls = ()
+    
+    # Extract actions
+    actions = tuple(action for action, _ in _ACTION_KEYWORDS if ('action', action) in found)
+    
+    return TaskAnalysis(
+        type=task_type,
+        urls=urls,
+        actions=actions,
+        complexity=len(actions),
+        requires_auth='login' in task_type or ('auth', 'auth') in found,
+        requires_data_extraction='extract' in actions or 'scraping' in task_type,
+        requires_form_interaction='form_filling' in task_type or 'input' in actions
+    )
+
+@functools.lru_cache(maxsize=None)
+def _template_env() -> 'Environment':
+    """Jinja environment shared by all generators, created on first use.
+    
+    Importing jinja2 is deferred so that only generators that actually
+    render templates pay for it. Templates are plain text, so there is no
+    autoescaping.
+    """
+    from jinja2 import Environment, BaseLoader
+    return Environment(loader=BaseLoader(), auto_reload=False)
 
 class BaseGenerator:
     """Base class for code generators."""
     
+    # Capability metadata, readable without instantiating the generator
+    LANGUAGE_NAME: ClassVar[str]
+    FRAMEWORKS: ClassVar[Tuple[str, ...]] = ()
+    FEATURES: ClassVar[Tuple[str, ...]] = ()
+    FILE_EXTENSIONS: ClassVar[Tuple[str, ...]]
+    
     def __init__(self):
-        self.templates = self._load_templates()
+        # Compile templates once per generator class, not once per instance
+        cls = type(self)
+        templates = cls.__dict__.get('_compiled_templates')
+        if templates is None:
+            templates = self._load_templates()
+            cls._compiled_templates = templates
+        self.templates = templates
     
     async def generate(self, 
                      task_description: str,
-                     task_analysis: Dict[str, Any],
+                     task_analysis: TaskAnalysis,
                      framework: Optional[str] = None,
                      include_tests: bool = True,
                      include_docs: bool = True) -> Dict[str, Any]:
@@ -127,77 +206,31 @@ class BaseGenerator:
     
     def get_language_name(self) -> str:
         """Get human-readable language name."""
-        raise NotImplementedError
+        return self.LANGUAGE_NAME
     
     def get_supported_frameworks(self) -> List[str]:
         """Get list of supported frameworks."""
-        return []
+        return list(self.FRAMEWORKS)
     
     def get_features(self) -> List[str]:
         """Get list of supported features."""
-        return []
+        return list(self.FEATURES)
     
     def get_file_extensions(self) -> List[str]:
         """Get file extensions for this language."""
-        raise NotImplementedError
+        return list(self.FILE_EXTENSIONS)
     
-    def _load_templates(self) -> Dict[str, Template]:
+    def _load_templates(self) -> Dict[str, 'Template']:
         """Load code templates."""
         return {}
     
-    def _generate_dependencies(self, task_analysis: Dict[str, Any], framework: Optional[str]) -> List[str]:
+    def _generate_dependencies(self, task_analysis: TaskAnalysis, framework: Optional[str]) -> List[str]:
         """Generate list of dependencies."""
         return []
 
-class PythonGenerator(BaseGenerator):
-    """Python code generator."""
-    
-    def get_language_name(self) -> str:
-        return "Python"
-    
-    def get_supported_frameworks(self) -> List[str]:
-        return ["playwright", "selenium", "browser-use", "requests-html"]
-    
-    def get_features(self) -> List[str]:
-        return ["async/await", "type hints", "dataclasses", "context managers"]
-    
-    def get_file_extensions(self) -> List[str]:
-        return [".py"]
-    
-    async def generate(self, 
-                     task_description: str,
-                     task_analysis: Dict[str, Any],
-                     framework: Optional[str] = None,
-                     include_tests: bool = True,
-                     include_docs: bool = True) -> Dict[str, Any]:
-        
-        framework = framework or "browser-use"
-        
-        if framework == "browser-use":
-            code = self._generate_browser_use_code(task_description, task_analysis)
-        elif framework == "playwright":
-            code = self._generate_playwright_code(task_description, task_analysis)
-        elif framework == "selenium":
-            code = self._generate_selenium_code(task_description, task_analysis)
-        else:
-            code = self._generate_browser_use_code(task_description, task_analysis)
-        
-        tests = self._generate_tests(task_analysis, framework) if include_tests else None
-        docs = self._generate_documentation(task_description, task_analysis) if include_docs else None
-        dependencies = self._generate_dependencies(task_analysis, framework)
-        
-        return {
-            'language': 'python',
-            'framework': framework,
-            'code': code,
-            'tests': tests,
-            'documentation': docs,
-            'dependencies': dependencies
-        }
-    
-    def _generate_browser_use_code(self, task_description: str, task_analysis: Dict[str, Any]) -> str:
-        template = '''
-"""Browser automation script generated for: {task_description}"""
+# Jinja templates for the Python generator
+_BROWSER_USE_TEMPLATE = '''
+"""Browser automation script generated for: {{ task_description }}"""
 
 import asyncio
 from datetime import datetime
@@ -213,25 +246,25 @@ from automation_utils import performance_monitor, format_duration
 load_dotenv()
 
 class AutomationTask:
-    """Automated task: {task_description}"""
+    """Automated task: {{ task_description }}"""
     
     def __init__(self, config_name: Optional[str] = None):
-        self.task_description = "{task_description}"
+        self.task_description = "{{ task_description }}"
         self.config = get_recommended_config(self.task_description) if not config_name else None
         self.schema = get_schema_for_task(self.task_description)
-        self.results = {{}}
+        self.results = {}
     
     @performance_monitor
     async def run(self) -> Dict[str, Any]:
         """Execute the automation task."""
-        print(f"Starting task: {{self.task_description}}")
-        print(f"Configuration: {{self.config['name']}}")
+        print(f"Starting task: {self.task_description}")
+        print(f"Configuration: {self.config['name']}")
         
         try:
             # Create browser with optimized settings
             browser = Browser(
-                headless={headless},
-                window_size={{'width': 1920, 'height': 1080}},
+                headless={{ headless }},
+                window_size={'width': 1920, 'height': 1080},
                 highlight_elements=True,
                 wait_between_actions=0.3
             )
@@ -250,23 +283,23 @@ class AutomationTask:
             result = await agent.run()
             duration = (datetime.now() - start_time).total_seconds()
             
-            self.results = {{
+            self.results = {
                 'status': 'completed',
                 'result': result,
                 'duration': duration,
                 'timestamp': datetime.now().isoformat()
-            }}
+            }
             
-            print(f"Task completed successfully in {{format_duration(duration)}}")
+            print(f"Task completed successfully in {format_duration(duration)}")
             return self.results
             
         except Exception as e:
-            self.results = {{
+            self.results = {
                 'status': 'failed',
                 'error': str(e),
                 'timestamp': datetime.now().isoformat()
-            }}
-            print(f"Task failed: {{e}}")
+            }
+            print(f"Task failed: {e}")
             return self.results
     
     def get_results(self) -> Dict[str, Any]:
@@ -279,33 +312,27 @@ async def main():
     result = await task.run()
     
     print("\nFinal Results:")
-    print(f"Status: {{result['status']}}")
+    print(f"Status: {result['status']}")
     if result['status'] == 'completed':
-        print(f"Duration: {{format_duration(result['duration'])}}")
+        print(f"Duration: {format_duration(result['duration'])}")
         if 'result' in result:
-            print(f"Output: {{result['result']}}")
+            print(f"Output: {result['result']}")
     else:
-        print(f"Error: {{result['error']}}")
+        print(f"Error: {result['error']}")
 
 if __name__ == "__main__":
     asyncio.run(main())
-'''.format(
-            task_description=task_description,
-            headless="True" if task_analysis.get('complexity', 0) > 3 else "False"
-        )
-        
-        return template.strip()
-    
-    def _generate_playwright_code(self, task_description: str, task_analysis: Dict[str, Any]) -> str:
-        template = '''
-"""Playwright automation script for: {task_description}"""
+'''
+
+_PLAYWRIGHT_TEMPLATE = '''
+"""Playwright automation script for: {{ task_description }}"""
 
 import asyncio
 from playwright.async_api import async_playwright, Page, Browser
 from typing import Dict, Any
 
 class PlaywrightAutomation:
-    """Playwright-based automation for: {task_description}"""
+    """Playwright-based automation for: {{ task_description }}"""
     
     def __init__(self):
         self.browser: Browser = None
@@ -315,11 +342,11 @@ class PlaywrightAutomation:
         """Set up browser and page."""
         playwright = await async_playwright().start()
         self.browser = await playwright.chromium.launch(
-            headless={headless},
+            headless={{ headless }},
             args=['--no-sandbox', '--disable-dev-shm-usage']
         )
         self.page = await self.browser.new_page()
-        await self.page.set_viewport_size({{'width': 1920, 'height': 1080}})
+        await self.page.set_viewport_size({'width': 1920, 'height': 1080})
     
     async def cleanup(self):
         """Clean up resources."""
@@ -335,12 +362,12 @@ class PlaywrightAutomation:
             
             # TODO: Implement specific automation steps
             # Example steps based on task analysis:
-            {automation_steps}
+            {{ automation_steps }}
             
-            return {{'status': 'completed', 'message': 'Task completed successfully'}}
+            return {'status': 'completed', 'message': 'Task completed successfully'}
             
         except Exception as e:
-            return {{'status': 'failed', 'error': str(e)}}
+            return {'status': 'failed', 'error': str(e)}
         
         finally:
             await self.cleanup()
@@ -348,21 +375,14 @@ class PlaywrightAutomation:
 async def main():
     automation = PlaywrightAutomation()
     result = await automation.run_automation()
-    print(f"Result: {{result}}")
+    print(f"Result: {result}")
 
 if __name__ == "__main__":
     asyncio.run(main())
-'''.format(
-            task_description=task_description,
-            headless="True" if task_analysis.get('complexity', 0) > 3 else "False",
-            automation_steps=self._generate_automation_steps(task_analysis)
-        )
-        
-        return template.strip()
-    
-    def _generate_selenium_code(self, task_description: str, task_analysis: Dict[str, Any]) -> str:
-        template = '''
-"""Selenium automation script for: {task_description}"""
+'''
+
+_SELENIUM_TEMPLATE = '''
+"""Selenium automation script for: {{ task_description }}"""
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -373,7 +393,7 @@ from typing import Dict, Any
 import time
 
 class SeleniumAutomation:
-    """Selenium-based automation for: {task_description}"""
+    """Selenium-based automation for: {{ task_description }}"""
     
     def __init__(self):
         self.driver = None
@@ -382,7 +402,7 @@ class SeleniumAutomation:
     def setup(self):
         """Set up WebDriver."""
         options = Options()
-        {chrome_options}
+        {{ chrome_options }}
         
         self.driver = webdriver.Chrome(options=options)
         self.driver.set_window_size(1920, 1080)
@@ -400,12 +420,12 @@ class SeleniumAutomation:
             
             # TODO: Implement specific automation steps
             # Example steps based on task analysis:
-            {automation_steps}
+            {{ automation_steps }}
             
-            return {{'status': 'completed', 'message': 'Task completed successfully'}}
+            return {'status': 'completed', 'message': 'Task completed successfully'}
             
         except Exception as e:
-            return {{'status': 'failed', 'error': str(e)}}
+            return {'status': 'failed', 'error': str(e)}
         
         finally:
             self.cleanup()
@@ -413,73 +433,50 @@ class SeleniumAutomation:
 def main():
     automation = SeleniumAutomation()
     result = automation.run_automation()
-    print(f"Result: {{result}}")
+    print(f"Result: {result}")
 
 if __name__ == "__main__":
     main()
-'''.format(
-            task_description=task_description,
-            chrome_options="options.add_argument('--headless')" if task_analysis.get('complexity', 0) > 3 else "# Running in headed mode",
-            automation_steps=self._generate_selenium_steps(task_analysis)
-        )
-        
-        return template.strip()
-    
-    def _generate_automation_steps(self, task_analysis: Dict[str, Any]) -> str:
-        steps = []
-        
-        if 'navigate' in task_analysis.get('actions', []):
-            if task_analysis.get('urls'):
-                url = task_analysis['urls'][0]
-                steps.append(f"            await self.page.goto('{url}')")
-            else:
-                steps.append("            # await self.page.goto('https://example.com')")
-        
-        if 'input' in task_analysis.get('actions', []):
-            steps.append("            # await self.page.fill('input[name=\"username\"]', 'your_username')")
-            steps.append("            # await self.page.fill('input[name=\"password\"]', 'your_password')")
-        
-        if 'click' in task_analysis.get('actions', []):
-            steps.append("            # await self.page.click('button[type=\"submit\"]')")
-        
-        if 'wait' in task_analysis.get('actions', []):
-            steps.append("            # await self.page.wait_for_selector('.result')")
-        
-        if 'extract' in task_analysis.get('actions', []):
-            steps.append("            # data = await self.page.text_content('.data-element')")
-            steps.append("            # return {'extracted_data': data}")
-        
-        return '\n'.join(steps) if steps else "            # Add your automation steps here"
-    
-    def _generate_selenium_steps(self, task_analysis: Dict[str, Any]) -> str:
-        steps = []
-        
-        if 'navigate' in task_analysis.get('actions', []):
-            if task_analysis.get('urls'):
-                url = task_analysis['urls'][0]
-                steps.append(f"            self.driver.get('{url}')")
-            else:
-                steps.append("            # self.driver.get('https://example.com')")
-        
-        if 'input' in task_analysis.get('actions', []):
-            steps.append("            # username_field = self.wait.until(EC.presence_of_element_located((By.NAME, 'username')))")
-            steps.append("            # username_field.send_keys('your_username')")
-        
-        if 'click' in task_analysis.get('actions', []):
-            steps.append("            # submit_button = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'button[type=\"submit\"]')))")
-            steps.append("            # submit_button.click()")
-        
-        if 'wait' in task_analysis.get('actions', []):
-            steps.append("            # self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, 'result')))")
-        
-        if 'extract' in task_analysis.get('actions', []):
-            steps.append("            # data_element = self.driver.find_element(By.CLASS_NAME, 'data-element')")
-            steps.append("            # return {'extracted_data': data_element.text}")
-        
-        return '\n'.join(steps) if steps else "            # Add your automation steps here"
-    
-    def _generate_tests(self, task_analysis: Dict[str, Any], framework: str) -> str:
-        return f'''
+'''
+
+# Step snippets for the Python templates, in the order they are emitted
+_PLAYWRIGHT_NAVIGATE = "            await self.page.goto('{url}')"
+_PLAYWRIGHT_NAVIGATE_DEFAULT = "            # await self.page.goto('https://example.com')"
+_PLAYWRIGHT_STEPS = (
+    ('input', "            # await self.page.fill('input[name=\"username\"]', 'your_username')\n"
+              "            # await self.page.fill('input[name=\"password\"]', 'your_password')"),
+    ('click', "            # await self.page.click('button[type=\"submit\"]')"),
+    ('wait', "            # await self.page.wait_for_selector('.result')"),
+    ('extract', "            # data = await self.page.text_content('.data-element')\n"
+                "            # return {'extracted_data': data}"),
+)
+
+_SELENIUM_NAVIGATE = "            self.driver.get('{url}')"
+_SELENIUM_NAVIGATE_DEFAULT = "            # self.driver.get('https://example.com')"
+_SELENIUM_STEPS = (
+    ('input', "            # username_field = self.wait.until(EC.presence_of_element_located((By.NAME, 'username')))\n"
+              "            # username_field.send_keys('your_username')"),
+    ('click', "            # submit_button = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'button[type=\"submit\"]')))\n"
+              "            # submit_button.click()"),
+    ('wait', "            # self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, 'result')))"),
+    ('extract', "            # data_element = self.driver.find_element(By.CLASS_NAME, 'data-element')\n"
+                "            # return {'extracted_data': data_element.text}"),
+)
+
+_NO_STEPS = "            # Add your automation steps here"
+
+@functools.lru_cache(maxsize=512)
+def _render_steps(actions: Tuple[str, ...], url: Optional[str], navigate: str,
+                  navigate_default: str, steps: Tuple[Tuple[str, str], ...]) -> str:
+    """Join the step snippets for ``actions``, navigating to ``url`` if given."""
+    parts = []
+    if 'navigate' in actions:
+        parts.append(navigate.format(url=url) if url else navigate_default)
+    parts.extend(snippet for action, snippet in steps if action in actions)
+    return '\n'.join(parts) if parts else _NO_STEPS
+
+# The generated test module is a fixed stub
+_PYTEST_STUB = '''
 """Tests for the automation script."""
 
 import pytest
@@ -500,21 +497,28 @@ def test_task_analysis():
 if __name__ == "__main__":
     pytest.main([__file__])
 '''
-    
-    def _generate_documentation(self, task_description: str, task_analysis: Dict[str, Any]) -> str:
-        return f'''
+
+@functools.lru_cache(maxsize=1)
+def _format_stamp(second: int) -> str:
+    """Format a generation timestamp; the stamp only changes once a second."""
+    return datetime.fromtimestamp(second).strftime('%Y-%m-%d %H:%M:%S')
+
+@functools.lru_cache(maxsize=256)
+def _documentation_body(task_description: str, task_analysis: TaskAnalysis) -> str:
+    """Documentation up to the generation timestamp, which changes per call."""
+    return f'''
 # Automation Script Documentation
 
 ## Task Description
 {task_description}
 
 ## Task Analysis
-- **Type**: {task_analysis.get('type', 'general')}
-- **Complexity**: {task_analysis.get('complexity', 0)}
-- **Actions**: {', '.join(task_analysis.get('actions', []))}
-- **URLs**: {', '.join(task_analysis.get('urls', []))}
-- **Requires Authentication**: {task_analysis.get('requires_auth', False)}
-- **Requires Data Extraction**: {task_analysis.get('requires_data_extraction', False)}
+- **Type**: {task_analysis.type}
+- **Complexity**: {task_analysis.complexity}
+- **Actions**: {', '.join(task_analysis.actions)}
+- **URLs**: {', '.join(task_analysis.urls)}
+- **Requires Authentication**: {task_analysis.requires_auth}
+- **Requires Data Extraction**: {task_analysis.requires_data_extraction}
 
 ## Usage
 
@@ -545,10 +549,95 @@ The script includes comprehensive error handling and will provide detailed
 error messages if something goes wrong.
 
 ## Generated on
-{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 '''
+
+class PythonGenerator(BaseGenerator):
+    """Python code generator."""
+    
+    LANGUAGE_NAME = "Python"
+    FRAMEWORKS = ("playwright", "selenium", "browser-use", "requests-html")
+    FEATURES = ("async/await", "type hints", "dataclasses", "context managers")
+    FILE_EXTENSIONS = (".py",)
+    
+    def _load_templates(self) -> Dict[str, 'Template']:
+        # Surrounding whitespace is literal text, so strip the sources once
+        # instead of stripping every rendered script
+        env = _template_env()
+        return {
+            'browser_use': env.from_string(_BROWSER_USE_TEMPLATE.strip()),
+            'playwright': env.from_string(_PLAYWRIGHT_TEMPLATE.strip()),
+            'selenium': env.from_string(_SELENIUM_TEMPLATE.strip())
+        }
+    
+    async def generate(self, 
+                     task_description: str,
+                     task_analysis: TaskAnalysis,
+                     framework: Optional[str] = None,
+                     include_tests: bool = True,
+                     include_docs: bool = True) -> Dict[str, Any]:
+        
+        framework = framework or "browser-use"
+        
+        if framework == "browser-use":
+            code = self._generate_browser_use_code(task_description, task_analysis)
+        elif framework == "playwright":
+            code = self._generate_playwright_code(task_description, task_analysis)
+        elif framework == "selenium":
+            code = self._generate_selenium_code(task_description, task_analysis)
+        else:
+            code = self._generate_browser_use_code(task_description, task_analysis)
+        
+        tests = self._generate_tests(task_analysis, framework) if include_tests else None
+        docs = self._generate_documentation(task_description, task_analysis) if include_docs else None
+        dependencies = self._generate_dependencies(task_analysis, framework)
+        
+        return {
+            'language': 'python',
+            'framework': framework,
+            'code': code,
+            'tests': tests,
+            'documentation': docs,
+            'dependencies': dependencies
+        }
     
-    def _generate_dependencies(self, task_analysis: Dict[str, Any], framework: str) -> List[str]:
+    def _generate_browser_use_code(self, task_description: str, task_analysis: TaskAnalysis) -> str:
+        return self.templates['browser_use'].render(
+            task_description=task_description,
+            headless="True" if task_analysis.complexity > 3 else "False"
+        )
+    
+    def _generate_playwright_code(self, task_description: str, task_analysis: TaskAnalysis) -> str:
+        return self.templates['playwright'].render(
+            task_description=task_description,
+            headless="True" if task_analysis.complexity > 3 else "False",
+            automation_steps=self._generate_automation_steps(task_analysis)
+        )
+    
+    def _generate_selenium_code(self, task_description: str, task_analysis: TaskAnalysis) -> str:
+        return self.templates['selenium'].render(
+            task_description=task_description,
+            chrome_options="options.add_argument('--headless')" if task_analysis.complexity > 3 else "# Running in headed mode",
+            automation_steps=self._generate_selenium_steps(task_analysis)
+        )
+    
+    def _generate_automation_steps(self, task_analysis: TaskAnalysis) -> str:
+        url = task_analysis.urls[0] if task_analysis.urls else None
+        return _render_steps(task_analysis.actions, url, _PLAYWRIGHT_NAVIGATE,
+                             _PLAYWRIGHT_NAVIGATE_DEFAULT, _PLAYWRIGHT_STEPS)
+    
+    def _generate_selenium_steps(self, task_analysis: TaskAnalysis) -> str:
+        url = task_analysis.urls[0] if task_analysis.urls else None
+        return _render_steps(task_analysis.actions, url, _SELENIUM_NAVIGATE,
+                             _SELENIUM_NAVIGATE_DEFAULT, _SELENIUM_STEPS)
+    
+    def _generate_tests(self, task_analysis: TaskAnalysis, framework: str) -> str:
+        return _PYTEST_STUB
+    
+    def _generate_documentation(self, task_description: str, task_analysis: TaskAnalysis) -> str:
+        body = _documentation_body(task_description, task_analysis)
+        return f"{body}{_format_stamp(int(time.time()))}\n"
+    
+    def _generate_dependencies(self, task_analysis: TaskAnalysis, framework: str) -> List[str]:
         base_deps = ["python-dotenv", "pydantic"]
         
         if framework == "browser-use":
@@ -562,16 +651,11 @@ error messages if something goes wrong.
 
 # Additional generators for other languages would follow similar patterns
 class JavaScriptGenerator(BaseGenerator):
-    def get_language_name(self) -> str:
-        return "JavaScript"
+    LANGUAGE_NAME = "JavaScript"
+    FRAMEWORKS = ("playwright", "puppeteer", "selenium-webdriver")
+    FILE_EXTENSIONS = (".js",)
     
-    def get_supported_frameworks(self) -> List[str]:
-        return ["playwright", "puppeteer", "selenium-webdriver"]
-    
-    def get_file_extensions(self) -> List[str]:
-        return [".js"]
-    
-    async def generate(self, task_description: str, task_analysis: Dict[str, Any], 
+    async def generate(self, task_description: str, task_analysis: TaskAnalysis, 
                      framework: Optional[str] = None, include_tests: bool = True, 
                      include_docs: bool = True) -> Dict[str, Any]:
         # JavaScript code generation implementation
@@ -585,16 +669,11 @@ class JavaScriptGenerator(BaseGenerator):
         }
 
 class TypeScriptGenerator(BaseGenerator):
-    def get_language_name(self) -> str:
-        return "TypeScript"
+    LANGUAGE_NAME = "TypeScript"
+    FRAMEWORKS = ("playwright", "puppeteer")
+    FILE_EXTENSIONS = (".ts",)
     
-    def get_supported_frameworks(self) -> List[str]:
-        return ["playwright", "puppeteer"]
-    
-    def get_file_extensions(self) -> List[str]:
-        return [".ts"]
-    
-    async def generate(self, task_description: str, task_analysis: Dict[str, Any], 
+    async def generate(self, task_description: str, task_analysis: TaskAnalysis, 
                      framework: Optional[str] = None, include_tests: bool = True, 
                      include_docs: bool = True) -> Dict[str, Any]:
         return {
@@ -608,71 +687,75 @@ class TypeScriptGenerator(BaseGenerator):
 
 # Placeholder generators for other languages
 class JavaGenerator(BaseGenerator):
-    def get_language_name(self) -> str:
-        return "Java"
-    
-    def get_file_extensions(self) -> List[str]:
-        return [".java"]
+    LANGUAGE_NAME = "Java"
+    FILE_EXTENSIONS = (".java",)
     
     async def generate(self, **kwargs) -> Dict[str, Any]:
         return {'language': 'java', 'code': '// Java code placeholder'}
 
 class CSharpGenerator(BaseGenerator):
-    def get_language_name(self) -> str:
-        return "C#"
-    
-    def get_file_extensions(self) -> List[str]:
-        return [".cs"]
+    LANGUAGE_NAME = "C#"
+    FILE_EXTENSIONS = (".cs",)
     
     async def generate(self, **kwargs) -> Dict[str, Any]:
         return {'language': 'csharp', 'code': '// C# code placeholder'}
 
 class GoGenerator(BaseGenerator):
-    def get_language_name(self) -> str:
-        return "Go"
-    
-    def get_file_extensions(self) -> List[str]:
-        return [".go"]
+    LANGUAGE_NAME = "Go"
+    FILE_EXTENSIONS = (".go",)
     
     async def generate(self, **kwargs) -> Dict[str, Any]:
         return {'language': 'go', 'code': '// Go code placeholder'}
 
 class RustGenerator(BaseGenerator):
-    def get_language_name(self) -> str:
-        return "Rust"
-    
-    def get_file_extensions(self) -> List[str]:
-        return [".rs"]
+    LANGUAGE_NAME = "Rust"
+    FILE_EXTENSIONS = (".rs",)
     
     async def generate(self, **kwargs) -> Dict[str, Any]:
         return {'language': 'rust', 'code': '// Rust code placeholder'}
 
 class PHPGenerator(BaseGenerator):
-    def get_language_name(self) -> str:
-        return "PHP"
-    
-    def get_file_extensions(self) -> List[str]:
-        return [".php"]
+    LANGUAGE_NAME = "PHP"
+    FILE_EXTENSIONS = (".php",)
     
     async def generate(self, **kwargs) -> Dict[str, Any]:
         return {'language': 'php', 'code': '<?php // PHP code placeholder'}
 
 class RubyGenerator(BaseGenerator):
-    def get_language_name(self) -> str:
-        return "Ruby"
-    
-    def get_file_extensions(self) -> List[str]:
-        return [".rb"]
+    LANGUAGE_NAME = "Ruby"
+    FILE_EXTENSIONS = (".rb",)
     
     async def generate(self, **kwargs) -> Dict[str, Any]:
         return {'language': 'ruby', 'code': '# Ruby code placeholder'}
 
 class KotlinGenerator(BaseGenerator):
-    def get_language_name(self) -> str:
-        return "Kotlin"
-    
-    def get_file_extensions(self) -> List[str]:
-        return [".kt"]
+    LANGUAGE_NAME = "Kotlin"
+    FILE_EXTENSIONS = (".kt",)
     
     async def generate(self, **kwargs) -> Dict[str, Any]:
-        return {'language': 'kotlin', 'code': '// Kotlin code placeholder'}
\ No newline at end of file
+        return {'language': 'kotlin', 'code': '// Kotlin code placeholder'}
+
+# Language key -> generator class, used by CodeGeneratorManager
+_GENERATORS: Dict[str, type] = {
+    'python': PythonGenerator,
+    'javascript': JavaScriptGenerator,
+    'typescript': TypeScriptGenerator,
+    'java': JavaGenerator,
+    'csharp': CSharpGenerator,
+    'go': GoGenerator,
+    'rust': RustGenerator,
+    'php': PHPGenerator,
+    'ruby': RubyGenerator,
+    'kotlin': KotlinGenerator
+}
+
+# Built from class-level metadata, so no generator has to be instantiated
+_SUPPORTED_LANGUAGES = freeze({
+    lang: {
+        'name': cls.LANGUAGE_NAME,
+        'frameworks': cls.FRAMEWORKS,
+        'features': cls.FEATURES,
+        'file_extensions': cls.FILE_EXTENSIONS
+    }
+    for lang, cls in _GENERATORS.items()
+})
@@ -5,11 +5,78 @@ import os
 import sys
 import subprocess
 import argparse
+import functools
+import hashlib
+import random
+import re
 import shutil
+import socket
+import threading
 import time
+from collections import deque
 from pathlib import Path
-import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+@functools.lru_cache(maxsize=16)
+def _which(cmd: str) -> Optional[str]:
+    """Memoized ``shutil.which``; PATH does not change during a deploy."""
+    return shutil.which(cmd)
+
+# Base images are re-pulled on the first build after this many seconds
+PULL_INTERVAL = 7 * 24 * 3600
+
+# Compose already builds and starts independent services concurrently in
+# dependency order; on a small VPS, cap how many it runs at once
+COMPOSE_PARALLEL_LIMIT = "4"
+
+# BuildKit plain progress: "#7 [backend 4/9] RUN pip install ..." opens a
+# step and "#7 DONE 42.1s" closes it
+_STEP_START_RE = re.compile(r"#(\d+) \[(.+?)\] (.*)")
+_STEP_DONE_RE = re.compile(r"#(\d+) DONE (\d+(?:\.\d+)?)s")
+
+# Steps quicker than this are left out of the post-build timing summary
+SLOW_STEP_SECONDS = 5.0
+
+# Left out of the build-context fingerprint: VCS metadata, bytecode, this
+# script's own marker files, and directories bind-mounted over the image
+# at runtime (their contents change on every run)
+_FINGERPRINT_SKIP = frozenset({
+    ".git", "__pycache__", ".last-pull", ".build-stamp",
+    "logs", "cache", "configs", "reports",
+})
+
+# Builds that fail on a network error are retried with exponential backoff;
+# anything else (disk full, OOM kill, a broken Dockerfile) fails immediately
+BUILD_ATTEMPTS = 3
+
+_BUILD_FAILURE_MARKERS = (
+    ("disk", ("no space left on device",)),
+    ("oom", ("out of memory", "cannot allocate memory", "killed")),
+    ("net", ("temporary failure", "timed out", "timeout", "connection reset", "connection refused",
+             "could not resolve", "tls handshake", "network is unreachable")),
+)
+
+def _classify_build_failure(output: str) -> str:
+    """Classify failed build output as ``disk``, ``oom``, ``net`` or ``other``."""
+    output = output.lower()
+    for kind, markers in _BUILD_FAILURE_MARKERS:
+        if any(marker in output for marker in markers):
+            return kind
+    return "other"
+
+def _tcp_ok(host: str, port: int, timeout: float) -> bool:
+    """Return True if a TCP connection to ``host:port`` can be opened."""
+    try:
+        socket.create_connection((host, port), timeout=timeout).close()
+        return True
+    except OSError:
+        return False
+
+def _redis_ping(host: str, port: int, timeout: float) -> bool:
+    """Send a raw RESP ``PING`` and check for ``+PONG``; needs no redis client."""
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.sendall(b"PING\r\n")
+        return sock.recv(64).startswith(b"+PONG")
 
 class VPSAutomationDeployer:
     """Handles VPS-specific deployment of the browser automation system."""
@@ -19,7 +86,43 @@ class VPSAutomationDeployer:
         self.docker_compose_file = self.project_root / "docker-compose.vps.yml"
         self.env_file = self.project_root / ".env"
         self.env_example = self.project_root / ".env.example"
+        self.pull_marker = self.project_root / ".last-pull"
+        self.build_stamp = self.project_root / ".build-stamp"
+    
+    @functools.cached_property
+    def compose(self) -> List[str]:
+        """Compose command: the ``docker compose`` plugin if present, else ``docker-compose``."""
+        if _which("docker"):
+            try:
+                subprocess.run(["docker", "compose", "version"], capture_output=True, check=True)
+                return ["docker", "compose"]
+            except (OSError, subprocess.CalledProcessError):
+                pass
+        return ["docker-compose"]
+    
+    @functools.cached_property
+    def _compose_env(self) -> Dict[str, str]:
+        """Environment for compose runs: BuildKit on, bounded parallelism."""
+        env = {**os.environ, "DOCKER_BUILDKIT": "1", "COMPOSE_DOCKER_CLI_BUILD": "1",
+               "BUILDKIT_PROGRESS": "plain"}
+        env.setdefault("COMPOSE_PARALLEL_LIMIT", COMPOSE_PARALLEL_LIMIT)
+        return env
+    
+    @functools.cached_property
+    def _compose_prefix(self) -> Tuple[str, ...]:
+        """Compose command bound to the VPS compose file."""
+        return (*self.compose, "-f", str(self.docker_compose_file))
+    
+    @functools.cached_property
+    def _http(self):
+        """HTTP session kept alive across health probes and readiness polls."""
+        import requests
+        from requests.adapters import HTTPAdapter
         
+        session = requests.Session()
+        session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=0))
+        return session
+    
     def check_vps_prerequisites(self) -> bool:
         """Check VPS-specific prerequisites."""
         print("🔍 Checking VPS prerequisites...")
@@ -31,7 +134,9 @@ class VPSAutomationDeployer:
         
         missing = []
         for cmd, description in required_commands:
-            if not shutil.which(cmd):
+            if cmd == "docker-compose" and self.compose != ["docker-compose"]:
+                continue  # the compose plugin stands in for the standalone binary
+            if not _which(cmd):
                 missing.append((cmd, description))
         
         if missing:
@@ -44,31 +149,100 @@ class VPSAutomationDeployer:
             print("   sudo usermod -aG docker $USER")
             return False
         
+        self.check_vps_resources()
+        
         print("✅ VPS prerequisites checked")
         return True
     
-    def build_vps_images(self) -> bool:
+    def _create_env_file(self) -> None:
+        """Create .env from the template.
+        
+        The copy goes to a temporary file that is renamed into place, so an
+        interrupted copy never leaves a truncated .env that later runs would
+        treat as configured.
+        """
+        tmp_file = self.env_file.with_name(self.env_file.name + ".tmp")
+        shutil.copyfile(self.env_example, tmp_file)
+        os.replace(tmp_file, self.env_file)
+    
+    def check_vps_resources(self) -> None:
+        """Warn when memory or disk is below the recommended VPS size.
+        
+        Reads /proc/meminfo and statvfs directly rather than running
+        ``free``/``df``; either check is skipped where it is unavailable.
+        """
+        try:
+            with open("/proc/meminfo") as meminfo:
+                total_kb = int(next(line for line in meminfo if line.startswith("MemTotal:")).split()[1])
+            total_mb = total_kb // 1024
+            print(f"   Memory: {total_mb} MB total")
+            if total_mb < 4 * 1024:
+                print("⚠️  Less than 4GB RAM; builds and browsers may run out of memory")
+        except (OSError, StopIteration, ValueError):
+            pass
+        
+        try:
+            stats = os.statvfs(self.project_root)
+            available_gb = stats.f_bavail * stats.f_frsize / (1 << 30)
+            print(f"   Disk: {available_gb:.1f} GB available")
+            if available_gb < 10:
+                print("⚠️  Less than 10GB disk available; image builds may fail")
+        except (AttributeError, OSError):
+            pass
+    
+    def build_vps_images(self, no_cache: bool = False) -> bool:
         """Build Docker images with VPS-specific optimizations."""
         print("🏗️  Building VPS-optimized Docker images...")
         
         try:
-            cmd = ["docker-compose", "-f", str(self.docker_compose_file), "build", "--no-cache"]
+            # Build services in parallel on BuildKit and reuse cached layers
+            # unless a from-scratch rebuild is requested
+            cmd = [*self._compose_prefix, "build", "--parallel"]
+            if no_cache:
+                cmd.append("--no-cache")
+            pull = self._pull_due()
+            if pull:
+                cmd.append("--pull")
             
-            result = subprocess.run(
-                cmd,
-                cwd=self.project_root,
-                capture_output=True,
-                text=True
-            )
+            # The image copies the whole project, so skip the build when no
+            # file in the build context changed since the last good build
+            fingerprint = self._context_fingerprint()
+            if not (no_cache or pull) and self._read_build_stamp() == fingerprint:
+                print("✅ Build context unchanged since the last build, skipping")
+                return True
             
-            if result.returncode != 0:
-                print(f"❌ Build failed: {result.stderr}")
+            for attempt in range(BUILD_ATTEMPTS):
+                returncode, output, step_times = self._run_build(cmd)
+                if returncode == 0:
+                    break
+                
+                if _classify_build_failure(output) == "net" and attempt < BUILD_ATTEMPTS - 1:
+                    delay = 2 * 2 ** attempt + random.uniform(0, 1)
+                    print(f"🌐 Build hit a network error, retrying in {delay:.1f}s...")
+                    time.sleep(delay)
+                    continue
+                
+                print(f"❌ Build failed (exit code {returncode}), last output:")
+                print(output, end="")
                 print("\n🔧 Troubleshooting tips:")
                 print("   - Check internet connectivity")
                 print("   - Ensure sufficient disk space (10GB+)")
                 print("   - Try: docker system prune -f")
                 return False
             
+            if pull:
+                self.pull_marker.touch()
+            self.build_stamp.write_text(fingerprint)
+            
+            slow_steps = sorted(
+                ((seconds, step) for step, seconds in step_times.items() if seconds >= SLOW_STEP_SECONDS),
+                reverse=True
+            )
+            if slow_steps:
+                print("⏱️  Slowest build steps:")
+                for seconds, step in slow_steps[:5]:
+                    print(f"   {seconds:6.1f}s  {step[:100]}")
+            
             print("✅ VPS-optimized Docker images built successfully")
             return True
             
@@ -76,6 +250,63 @@ class VPSAutomationDeployer:
             print(f"❌ Error building images: {e}")
             return False
     
+    def _context_fingerprint(self) -> str:
+        """Fingerprint the build context from file paths, sizes and mtimes."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.docker_compose_file.name.encode())
+        for root, dirs, files in os.walk(self.project_root):
+            if root == str(self.project_root):
+                dirs[:] = [d for d in dirs if d not in _FINGERPRINT_SKIP]
+                files = [f for f in files if f not in _FINGERPRINT_SKIP]
+            elif "__pycache__" in dirs:
+                dirs.remove("__pycache__")
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                digest.update(f"{os.path.relpath(path, self.project_root)}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+        return digest.hexdigest()
+    
+    def _read_build_stamp(self) -> Optional[str]:
+        """Return the fingerprint recorded by the last successful build."""
+        try:
+            return self.build_stamp.read_text().strip()
+        except FileNotFoundError:
+            return None
+    
+    def _run_build(self, cmd: List[str]) -> Tuple[int, str, Dict[str, float]]:
+        """Run a build, echoing its output.
+        
+        Returns the exit code, the output tail and the duration of every
+        BuildKit step that ran (cached steps report no duration).
+        """
+        # Stream build output as it arrives, keeping only a short tail
+        # in memory to repeat if the build fails
+        tail = deque(maxlen=50)
+        step_names: Dict[str, str] = {}
+        step_times: Dict[str, float] = {}
+        with subprocess.Popen(
+            cmd,
+            cwd=self.project_root,
+            env=self._compose_env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
+        ) as process:
+            for line in process.stdout:
+                tail.append(line)
+                print(line, end="")
+                if line.startswith("#"):
+                    match = _STEP_START_RE.match(line)
+                    if match:
+                        step_names[match.group(1)] = f"[{match.group(2)}] {match.group(3).strip()}"
+                    else:
+                        match = _STEP_DONE_RE.match(line)
+                        if match and match.group(1) in step_names:
+                            step_times[step_names[match.group(1)]] = float(match.group(2))
+        return process.returncode, "".join(tail), step_times
+    
     def start_vps_services(self, profiles: List[str] = None) -> bool:
         """Start Docker services with VPS-specific configuration."""
         profiles = profiles or []
@@ -83,14 +314,20 @@ class VPSAutomationDeployer:
         print(f"🚀 Starting VPS services{' with profiles: ' + ', '.join(profiles) if profiles else ''}...")
         
         try:
-            cmd = ["docker-compose", "-f", str(self.docker_compose_file), "up", "-d"]
-            
+            # --profile is a global compose option and must precede the subcommand
+            cmd = [*self._compose_prefix]
             for profile in profiles:
                 cmd.extend(["--profile", profile])
+            cmd.extend(["up", "-d"])
+            
+            # Import requests and set up the probe session while compose
+            # brings the containers up, instead of on the first readiness poll
+            threading.Thread(target=self._warm_up_probes, daemon=True).start()
             
             result = subprocess.run(
                 cmd,
                 cwd=self.project_root,
+                env=self._compose_env,
                 capture_output=True,
                 text=True
             )
@@ -101,9 +338,10 @@ class VPSAutomationDeployer:
             
             print("✅ VPS services started successfully")
             
-            # Wait for services to be ready
+            # Wait for services to be ready, for at most as long as the old fixed delay
             print("⏳ Waiting for services to initialize...")
-            time.sleep(30)
+            if not self._wait_ready(timeout=30):
+                print("⚠️  Services not ready yet, continuing")
             
             return True
             
@@ -115,59 +353,89 @@ class VPSAutomationDeployer:
         """Perform VPS-specific health check."""
         print("🏥 Performing VPS health check...")
         
+        results = self._probe_services()
+        
+        for service, status in results.items():
+            print(f"   {service}: {status}")
+        
+        return results
+    
+    def _warm_up_probes(self) -> None:
+        """Create the HTTP probe session ahead of the first health probe."""
+        try:
+            self._http
+        except ImportError:
+            pass  # reported by the probe itself
+    
+    def _pull_due(self) -> bool:
+        """Return True if base images were last pulled over PULL_INTERVAL ago."""
+        try:
+            return time.time() - self.pull_marker.stat().st_mtime > PULL_INTERVAL
+        except FileNotFoundError:
+            return True
+    
+    def _probe_services(self) -> Dict[str, str]:
+        """Probe every service and return its status line by name."""
         services = {
             "FastAPI Backend": "http://localhost:8000/health",
             "VNC Server": "localhost:5901",
             "Redis": "localhost:6379"
         }
         
-        results = {}
-        
-        for service, endpoint in services.items():
-            try:
-                if service == "FastAPI Backend":
-                    import requests
-                    response = requests.get(endpoint, timeout=10)
-                    results[service] = "✅ Healthy" if response.status_code == 200 else "❌ Unhealthy"
-                elif service == "VNC Server":
-                    import socket
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(5)
-                    result = sock.connect_ex(('localhost', 5901))
-                    sock.close()
-                    results[service] = "✅ Healthy" if result == 0 else "❌ Unhealthy"
-                elif service == "Redis":
-                    import redis
-                    r = redis.Redis(host='localhost', port=6379, decode_responses=True, socket_timeout=5)
-                    r.ping()
-                    results[service] = "✅ Healthy"
-            except Exception as e:
-                results[service] = f"❌ Error: {str(e)[:50]}"
-        
-        for service, status in results.items():
-            print(f"   {service}: {status}")
+        # Imported here: concurrent.futures pulls in logging, which is only
+        # worth loading once services are up and actually being probed
+        from concurrent.futures import ThreadPoolExecutor
         
-        return results
+        # Probe all services at once so the check takes as long as the
+        # slowest probe rather than the sum of their timeouts
+        with ThreadPoolExecutor(max_workers=len(services)) as executor:
+            return dict(zip(services, executor.map(self._probe_service, services, services.values())))
+    
+    def _wait_ready(self, timeout: float, interval: float = 0.5) -> bool:
+        """Poll the services until all are healthy or ``timeout`` seconds pass."""
+        deadline = time.monotonic() + timeout
+        while True:
+            if all(status.startswith("✅") for status in self._probe_services().values()):
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 1.5, 5.0)
+    
+    def _probe_service(self, service: str, endpoint: str) -> str:
+        """Probe a single service and return its status line."""
+        try:
+            if service == "FastAPI Backend":
+                response = self._http.get(endpoint, timeout=2)
+                return "✅ Healthy" if response.status_code == 200 else "❌ Unhealthy"
+            elif service == "VNC Server":
+                return "✅ Healthy" if _tcp_ok('localhost', 5901, timeout=5) else "❌ Unhealthy"
+            elif service == "Redis":
+                return "✅ Healthy" if _redis_ping('localhost', 6379, timeout=5) else "❌ Unhealthy"
+        except Exception as e:
+            return f"❌ Error: {str(e)[:50]}"
     
-    def deploy_to_vps(self, profiles: List[str] = None, build: bool = True) -> bool:
+    def deploy_to_vps(self, profiles: List[str] = None, build: bool = True, no_cache: bool = False,
+                      assume_prereqs: bool = False) -> bool:
         """Full VPS deployment process."""
         print("🚀 Starting VPS Browser Automation System Deployment")
         print("=" * 60)
         
         # Check VPS prerequisites
-        if not self.check_vps_prerequisites():
+        if not assume_prereqs and not self.check_vps_prerequisites():
             return False
         
         # Setup environment
         if not self.env_file.exists():
             if self.env_example.exists():
-                shutil.copy(self.env_example, self.env_file)
+                self._create_env_file()
                 print(f"📋 Created .env file from template")
                 print("⚠️  Please edit .env file with your API keys before continuing")
                 return False
         
         # Build images if requested
-        if build and not self.build_vps_images():
+        if build and not self.build_vps_images(no_cache):
             return False
         
         # Start services
@@ -187,8 +455,9 @@ class VPSAutomationDeployer:
         
         print("\n💡 VPS Management Tips:")
         print("   - Monitor resources: docker stats")
-        print("   - View logs: docker-compose -f docker-compose.vps.yml logs -f")
-        print("   - Update system: docker-compose -f docker-compose.vps.yml pull")
+        compose = " ".join(self.compose)
+        print(f"   - View logs: {compose} -f docker-compose.vps.yml logs -f")
+        print(f"   - Update system: {compose} -f docker-compose.vps.yml pull")
         print("   - Backup data: tar -czf backup.tar.gz logs cache configs reports")
         
         return True
@@ -200,6 +469,8 @@ def main():
     # Deploy command
     deploy_parser = subparsers.add_parser("deploy", help="Deploy to VPS")
     deploy_parser.add_argument("--no-build", action="store_true", help="Skip building images")
+    deploy_parser.add_argument("--force-rebuild", action="store_true", help="Rebuild images without the layer cache")
+    deploy_parser.add_argument("--assume-prereqs", action="store_true", help="Skip the prerequisite check (e.g. in CI)")
     
     # Other commands
     subparsers.add_parser("health", help="Perform health check")
@@ -210,7 +481,9 @@ def main():
     
     if args.command == "deploy" or args.command is None:
         build = not (args.command == "deploy" and args.no_build)
-        success = deployer.deploy_to_vps([], build)
+        no_cache = args.command == "deploy" and args.force_rebuild
+        assume_prereqs = args.command == "deploy" and args.assume_prereqs
+        success = deployer.deploy_to_vps([], build, no_cache, assume_prereqs)
         sys.exit(0 if success else 1)
     
     elif args.command == "health":
@@ -5,10 +5,35 @@ import os
 import sys
 import subprocess
 import argparse
+import functools
 import shutil
+import socket
+import time
+from collections import deque
 from pathlib import Path
-import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+@functools.lru_cache(maxsize=16)
+def _which(cmd: str) -> Optional[str]:
+    """Memoized ``shutil.which``; PATH does not change during a deploy."""
+    return shutil.which(cmd)
+
+# Base images are re-pulled on the first build after this many seconds
+PULL_INTERVAL = 7 * 24 * 3600
+
+def _tcp_ok(host: str, port: int, timeout: float) -> bool:
+    """Return True if a TCP connection to ``host:port`` can be opened."""
+    try:
+        socket.create_connection((host, port), timeout=timeout).close()
+        return True
+    except OSError:
+        return False
+
+def _redis_ping(host: str, port: int, timeout: float) -> bool:
+    """Send a raw RESP ``PING`` and check for ``+PONG``; needs no redis client."""
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.sendall(b"PING\r\n")
+        return sock.recv(64).startswith(b"+PONG")
 
 class AutomationDeployer:
     """Handles deployment of the browser automation system."""
@@ -18,7 +43,29 @@ class AutomationDeployer:
         self.docker_compose_file = self.project_root / "docker-compose.yml"
         self.env_file = self.project_root / ".env"
         self.env_example = self.project_root / ".env.example"
-        
+        self.pull_marker = self.project_root / ".last-pull"
+    
+    @functools.cached_property
+    def compose(self) -> List[str]:
+        """Compose command: the ``docker compose`` plugin if present, else ``docker-compose``."""
+        if _which("docker"):
+            try:
+                subprocess.run(["docker", "compose", "version"], capture_output=True, check=True)
+                return ["docker", "compose"]
+            except (OSError, subprocess.CalledProcessError):
+                pass
+        return ["docker-compose"]
+    
+    @functools.cached_property
+    def _http(self):
+        """HTTP session kept alive across health probes and readiness polls."""
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        session = requests.Session()
+        session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=0))
+        return session
+    
     def check_prerequisites(self) -> bool:
         """Check if all prerequisites are installed."""
         print("🔍 Checking prerequisites...")
@@ -30,7 +77,9 @@ class AutomationDeployer:
         
         missing = []
         for cmd, description in required_commands:
-            if not shutil.which(cmd):
+            if cmd == "docker-compose" and self.compose != ["docker-compose"]:
+                continue  # the compose plugin stands in for the standalone binary
+            if not _which(cmd):
                 missing.append((cmd, description))
         
         if missing:
@@ -42,13 +91,24 @@ class AutomationDeployer:
         print("✅ All prerequisites found")
         return True
     
+    def _create_env_file(self) -> None:
+        """Create .env from the template.
+        
+        The copy goes to a temporary file that is renamed into place, so an
+        interrupted copy never leaves a truncated .env that later runs would
+        treat as configured.
+        """
+        tmp_file = self.env_file.with_name(self.env_file.name + ".tmp")
+        shutil.copyfile(self.env_example, tmp_file)
+        os.replace(tmp_file, self.env_file)
+    
     def setup_environment(self) -> bool:
         """Set up environment configuration."""
         print("🔧 Setting up environment...")
         
         if not self.env_file.exists():
             if self.env_example.exists():
-                shutil.copy(self.env_example, self.env_file)
+                self._create_env_file()
                 print(f"📋 Created .env file from template")
                 print("⚠️  Please edit .env file with your API keys before continuing")
                 return False
@@ -82,22 +142,44 @@ class AutomationDeployer:
         print("✅ Environment configuration ready")
         return True
     
-    def build_images(self) -> bool:
+    def build_images(self, no_cache: bool = False) -> bool:
         """Build Docker images."""
         print("🏗️  Building Docker images...")
         
         try:
-            result = subprocess.run(
-                ["docker-compose", "build", "--no-cache"],
+            # Build services in parallel on BuildKit and reuse cached layers
+            # unless a from-scratch rebuild is requested
+            cmd = [*self.compose, "build", "--parallel"]
+            if no_cache:
+                cmd.append("--no-cache")
+            pull = self._pull_due()
+            if pull:
+                cmd.append("--pull")
+            
+            # Stream build output as it arrives, keeping only a short tail
+            # in memory to repeat if the build fails
+            tail = deque(maxlen=50)
+            with subprocess.Popen(
+                cmd,
                 cwd=self.project_root,
-                capture_output=True,
-                text=True
-            )
+                env={**os.environ, "DOCKER_BUILDKIT": "1", "COMPOSE_DOCKER_CLI_BUILD": "1"},
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1
+            ) as process:
+                for line in process.stdout:
+                    tail.append(line)
+                    print(line, end="")
             
-            if result.returncode != 0:
-                print(f"❌ Build failed: {result.stderr}")
+            if process.returncode != 0:
+                print(f"❌ Build failed (exit code {process.returncode}), last output:")
+                print("".join(tail), end="")
                 return False
             
+            if pull:
+                self.pull_marker.touch()
+            
             print("✅ Docker images built successfully")
             return True
             
@@ -112,10 +194,11 @@ class AutomationDeployer:
         print(f"🚀 Starting services{' with profiles: ' + ', '.join(profiles) if profiles else ''}...")
         
         try:
-            cmd = ["docker-compose", "up", "-d"]
-            
+            # --profile is a global compose option and must precede the subcommand
+            cmd = [*self.compose]
             for profile in profiles:
                 cmd.extend(["--profile", profile])
+            cmd.extend(["up", "-d"])
             
             result = subprocess.run(
                 cmd,
@@ -141,7 +224,7 @@ class AutomationDeployer:
         
         try:
             result = subprocess.run(
-                ["docker-compose", "down"],
+                [*self.compose, "down"],
                 cwd=self.project_root,
                 capture_output=True,
                 text=True
@@ -164,7 +247,7 @@ class AutomationDeployer:
         
         try:
             result = subprocess.run(
-                ["docker-compose", "ps"],
+                [*self.compose, "ps"],
                 cwd=self.project_root,
                 capture_output=True,
                 text=True
@@ -180,7 +263,7 @@ class AutomationDeployer:
         print(f"📋 Logs{' for ' + service if service else ''}:")
         
         try:
-            cmd = ["docker-compose", "logs"]
+            cmd = [*self.compose, "logs"]
             
             if follow:
                 cmd.append("-f")
@@ -197,38 +280,61 @@ class AutomationDeployer:
         """Perform health check on services."""
         print("🏥 Performing health check...")
         
+        results = self._probe_services()
+        
+        for service, status in results.items():
+            print(f"   {service}: {status}")
+        
+        return results
+    
+    def _pull_due(self) -> bool:
+        """Return True if base images were last pulled over PULL_INTERVAL ago."""
+        try:
+            return time.time() - self.pull_marker.stat().st_mtime > PULL_INTERVAL
+        except FileNotFoundError:
+            return True
+    
+    def _probe_services(self) -> Dict[str, str]:
+        """Probe every service and return its status line by name."""
         services = {
             "FastAPI Backend": "http://localhost:8000/health",
             "VNC Server": "localhost:5901",
             "Redis": "localhost:6379"
         }
         
-        results = {}
-        
-        for service, endpoint in services.items():
-            try:
-                if service == "FastAPI Backend":
-                    import requests
-                    response = requests.get(endpoint, timeout=5)
-                    results[service] = "✅ Healthy" if response.status_code == 200 else "❌ Unhealthy"
-                elif service == "VNC Server":
-                    import socket
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    result = sock.connect_ex(('localhost', 5901))
-                    sock.close()
-                    results[service] = "✅ Healthy" if result == 0 else "❌ Unhealthy"
-                elif service == "Redis":
-                    import redis
-                    r = redis.Redis(host='localhost', port=6379, decode_responses=True)
-                    r.ping()
-                    results[service] = "✅ Healthy"
-            except Exception as e:
-                results[service] = f"❌ Error: {str(e)[:50]}"
+        # Imported here: concurrent.futures pulls in logging, which commands
+        # that never probe (status, logs, stop, ...) should not pay for
+        from concurrent.futures import ThreadPoolExecutor
         
-        for service, status in results.items():
-            print(f"   {service}: {status}")
-        
-        return results
+        # Probe all services at once so the check takes as long as the
+        # slowest probe rather than the sum of their timeouts
+        with ThreadPoolExecutor(max_workers=len(services)) as executor:
+            return dict(zip(services, executor.map(self._probe_service, services, services.values())))
+    
+    def _wait_ready(self, timeout: float, interval: float = 0.5) -> bool:
+        """Poll the services until all are healthy or ``timeout`` seconds pass."""
+        deadline = time.monotonic() + timeout
+        while True:
+            if all(status.startswith("✅") for status in self._probe_services().values()):
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 1.5, 5.0)
+    
+    def _probe_service(self, service: str, endpoint: str) -> str:
+        """Probe a single service and return its status line."""
+        try:
+            if service == "FastAPI Backend":
+                response = self._http.get(endpoint, timeout=2)
+                return "✅ Healthy" if response.status_code == 200 else "❌ Unhealthy"
+            elif service == "VNC Server":
+                return "✅ Healthy" if _tcp_ok('localhost', 5901, timeout=5) else "❌ Unhealthy"
+            elif service == "Redis":
+                return "✅ Healthy" if _redis_ping('localhost', 6379, timeout=5) else "❌ Unhealthy"
+        except Exception as e:
+            return f"❌ Error: {str(e)[:50]}"
     
     def cleanup(self) -> bool:
         """Clean up Docker resources."""
@@ -236,7 +342,7 @@ class AutomationDeployer:
         
         try:
             # Stop and remove containers
-            subprocess.run(["docker-compose", "down", "-v"], cwd=self.project_root)
+            subprocess.run([*self.compose, "down", "-v"], cwd=self.project_root)
             
             # Remove images
             result = subprocess.run(
@@ -255,13 +361,14 @@ class AutomationDeployer:
             print(f"❌ Error during cleanup: {e}")
             return False
     
-    def deploy(self, profiles: List[str] = None, build: bool = True) -> bool:
+    def deploy(self, profiles: List[str] = None, build: bool = True, no_cache: bool = False,
+               assume_prereqs: bool = False) -> bool:
         """Full deployment process."""
         print("🚀 Starting Browser Automation System Deployment")
         print("=" * 50)
         
         # Check prerequisites
-        if not self.check_prerequisites():
+        if not assume_prereqs and not self.check_prerequisites():
             return False
         
         # Setup environment
@@ -269,17 +376,17 @@ class AutomationDeployer:
             return False
         
         # Build images if requested
-        if build and not self.build_images():
+        if build and not self.build_images(no_cache):
             return False
         
         # Start services
         if not self.start_services(profiles):
             return False
         
-        # Wait a moment for services to start
+        # Wait for services to start, for at most as long as the old fixed delay
         print("⏳ Waiting for services to initialize...")
-        import time
-        time.sleep(10)
+        if not self._wait_ready(timeout=10):
+            print("⚠️  Services not ready yet, continuing")
         
         # Show status
         self.show_status()
@@ -313,6 +420,8 @@ def main():
     # Deploy command
     deploy_parser = subparsers.add_parser("deploy", help="Deploy the system")
     deploy_parser.add_argument("--no-build", action="store_true", help="Skip building images")
+    deploy_parser.add_argument("--force-rebuild", action="store_true", help="Rebuild images without the layer cache")
+    deploy_parser.add_argument("--assume-prereqs", action="store_true", help="Skip the prerequisite check (e.g. in CI)")
     deploy_parser.add_argument("--monitoring", action="store_true", help="Enable monitoring stack")
     deploy_parser.add_argument("--database", action="store_true", help="Enable database")
     
@@ -341,10 +450,14 @@ def main():
             if args.database:
                 profiles.append("database")
             build = not args.no_build
+            no_cache = args.force_rebuild
+            assume_prereqs = args.assume_prereqs
         else:
             build = True
+            no_cache = False
+            assume_prereqs = False
         
-        success = deployer.deploy(profiles, build)
+        success = deployer.deploy(profiles, build, no_cache, assume_prereqs)
         sys.exit(0 if success else 1)
     
     elif args.command == "start":
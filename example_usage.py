@@ -7,12 +7,12 @@ from typing import Dict, Any
 
 # Import our enhanced automation components
 from agents import BrowserAutomationBackend, TaskStep
-from automation_schemas import get_schema_for_task, LoginResult, COMMON_SCHEMAS
-from automation_configs import get_recommended_config, ConfigManager
+from automation_schemas import LoginResult, COMMON_SCHEMAS
+from automation_configs import classify_task, ConfigManager
 from automation_utils import (
-    RetryConfig, RetryStrategy, retry_async, monitor_performance,
+    RetryConfig, RetryStrategy, retry, monitor_performance,
     task_cache, validation_utils, human_behavior, error_analyzer,
-    generate_temp_email, format_duration
+    generate_temp_email, format_duration, thaw
 )
 
 class AutomationExamples:
@@ -28,19 +28,18 @@ class AutomationExamples:
         print("LEONARDO.AI LOGIN AUTOMATION EXAMPLE")
         print("=" * 80)
         
-        # Get optimized configuration for this task
         task_description = "Navigate to leonardo.ai and login using a temp mail from temp-mail.io"
-        config = get_recommended_config(task_description)
         
-        # Get appropriate schema for login automation
-        schema = get_schema_for_task(task_description)
+        # Get optimized configuration and the appropriate schema for this task
+        config_name, schema = classify_task(task_description)
+        config = self.config_manager.get_config(config_name)
         
         # Create backend with optimized config
         backend = BrowserAutomationBackend(config)
         
         # Add monitoring callback
         def step_monitor(step: TaskStep):
-            timestamp = step.timestamp.strftime('%H:%M:%S')
+            timestamp = step.wall_time.strftime('%H:%M:%S')
             print(f"[{timestamp}] {step.action}: {step.status.value}")
             if step.error:
                 print(f"  ❌ Error: {step.error}")
@@ -97,7 +96,7 @@ class AutomationExamples:
                     print(f"Raw result: {json.dumps(result['result'], indent=2)}")
             
             # Save detailed report
-            report_file = backend.save_task_report(task_id)
+            report_file = await backend.save_task_report(task_id)
             print(f"\n📄 Detailed report: {report_file}")
             
             # Show performance metrics
@@ -118,6 +117,9 @@ class AutomationExamples:
             print(f"\n❌ Task failed: {e}")
             print(f"💡 Suggestion: {error_analyzer.suggest_solution(str(e))}")
             return {'status': 'failed', 'error': str(e)}
+        
+        finally:
+            await backend.aclose()
     
     async def run_web_search_example(self):
         """Example of web search automation."""
@@ -126,8 +128,8 @@ class AutomationExamples:
         print("=" * 80)
         
         task_description = "Search Google for 'browser automation tools' and extract top 5 results with titles and URLs"
-        config = get_recommended_config(task_description)
-        schema = get_schema_for_task(task_description)
+        config_name, schema = classify_task(task_description)
+        config = self.config_manager.get_config(config_name)
         
         backend = BrowserAutomationBackend(config)
         
@@ -159,6 +161,9 @@ class AutomationExamples:
         except Exception as e:
             print(f"❌ Search failed: {e}")
             return {'status': 'failed', 'error': str(e)}
+        
+        finally:
+            await backend.aclose()
     
     async def run_form_filling_example(self):
         """Example of form filling automation."""
@@ -167,7 +172,8 @@ class AutomationExamples:
         print("=" * 80)
         
         task_description = "Fill out a contact form on a demo website with sample data"
-        config = get_recommended_config(task_description)
+        config_name, schema = classify_task(task_description)
+        config = thaw(self.config_manager.get_config(config_name))
         
         # Customize config for form filling
         config['browser']['wait_between_actions'] = 1.0  # Slower for form filling
@@ -179,7 +185,6 @@ class AutomationExamples:
             }
         }
         
-        schema = get_schema_for_task(task_description)
         backend = BrowserAutomationBackend(config)
         
         print(f"Task: {task_description}")
@@ -204,6 +209,9 @@ class AutomationExamples:
         except Exception as e:
             print(f"❌ Form filling failed: {e}")
             return {'status': 'failed', 'error': str(e)}
+        
+        finally:
+            await backend.aclose()
     
     async def run_data_extraction_example(self):
         """Example of data extraction automation."""
@@ -212,8 +220,8 @@ class AutomationExamples:
         print("=" * 80)
         
         task_description = "Extract product information from an e-commerce website including names, prices, and ratings"
-        config = get_recommended_config(task_description)
-        schema = get_schema_for_task(task_description)
+        config_name, schema = classify_task(task_description)
+        config = self.config_manager.get_config(config_name)
         
         backend = BrowserAutomationBackend(config)
         
@@ -238,6 +246,9 @@ class AutomationExamples:
         except Exception as e:
             print(f"❌ Data extraction failed: {e}")
             return {'status': 'failed', 'error': str(e)}
+        
+        finally:
+            await backend.aclose()
     
     async def run_batch_automation_example(self):
         """Example of running multiple automation tasks in sequence."""
@@ -257,33 +268,37 @@ class AutomationExamples:
         
         batch_results = []
         
-        for i, task_desc in enumerate(tasks, 1):
-            print(f"\n[{i}/{len(tasks)}] {task_desc}")
-            print("-" * 40)
-            
-            try:
-                task_id = f"batch_task_{i}"
-                backend.create_task(task_id, task_desc)
-                
-                # Add retry logic for batch processing
-                retry_config = RetryConfig(
-                    max_attempts=2,
-                    strategy=RetryStrategy.LINEAR,
-                    base_delay=1.0
-                )
-                
-                @retry_async(retry_config)
-                async def run_with_retry():
-                    return await backend.run_task(task_id)
-                
-                result = await run_with_retry()
-                batch_results.append(result)
-                
-                print(f"✅ Completed in {format_duration(result['duration'])}")
+        try:
+            for i, task_desc in enumerate(tasks, 1):
+                print(f"\n[{i}/{len(tasks)}] {task_desc}")
+                print("-" * 40)
                 
-            except Exception as e:
-                print(f"❌ Failed: {e}")
-                batch_results.append({'status': 'failed', 'error': str(e)})
+                try:
+                    task_id = f"batch_task_{i}"
+                    backend.create_task(task_id, task_desc)
+                    
+                    # Add retry logic for batch processing
+                    retry_config = RetryConfig(
+                        max_attempts=2,
+                        strategy=RetryStrategy.LINEAR,
+                        base_delay=1.0
+                    )
+                    
+                    @retry(retry_config)
+                    async def run_with_retry():
+                        return await backend.run_task(task_id)
+                    
+                    result = await run_with_retry()
+                    batch_results.append(result)
+                    
+                    print(f"✅ Completed in {format_duration(result['duration'])}")
+                    
+                except Exception as e:
+                    print(f"❌ Failed: {e}")
+                    batch_results.append({'status': 'failed', 'error': str(e)})
+        
+        finally:
+            await backend.aclose()
         
         # Summary
         successful = sum(1 for r in batch_results if r.get('status') == 'completed')
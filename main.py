@@ -16,12 +16,12 @@ from pydantic import BaseModel
 import uvicorn
 
 # Import our automation components
-from agents import BrowserAutomationBackend, TaskStep, TaskStatus
+from agents import BrowserAutomationBackend, TaskStep, TaskStatus, create_http_client
 from automation_schemas import get_schema_for_task, COMMON_SCHEMAS
 from automation_configs import get_recommended_config, ConfigManager
 from automation_utils import (
     performance_monitor, task_cache, error_analyzer,
-    format_duration, generate_temp_email
+    format_duration, generate_temp_email, json_default, thaw
 )
 from code_generators import CodeGeneratorManager
 from vnc_manager import VNCManager
@@ -52,6 +52,7 @@ templates = Jinja2Templates(directory="templates")
 config_manager = ConfigManager()
 code_generator = CodeGeneratorManager()
 vnc_manager = VNCManager()
+http_client = create_http_client()  # Keep-alive LLM connections shared by all backends
 
 # Active connections and tasks
 active_connections: Dict[str, WebSocket] = {}
@@ -123,6 +124,29 @@ class ConnectionManager:
 
 manager = ConnectionManager()
 
+def create_backend(config: Dict[str, Any]) -> BrowserAutomationBackend:
+    """Create a backend that streams step updates for tasks that asked for them."""
+    backend = BrowserAutomationBackend(config, http_client=http_client)
+    
+    async def stream_callback(step: TaskStep):
+        task = backend.current_task
+        if task is None or not active_tasks.get(task.task_id, {}).get("request", {}).get("stream_output"):
+            return
+        await manager.send_personal_message({
+            "type": "step_update",
+            "task_id": task.task_id,
+            "step": step.to_dict()
+        }, task.task_id)
+    
+    backend.add_step_callback(stream_callback)
+    return backend
+
+@app.on_event("shutdown")
+async def close_backends():
+    for backend in list(active_backends.values()):
+        await backend.aclose()
+    await http_client.aclose()
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -153,11 +177,11 @@ async def create_task(task_request: TaskRequest, background_tasks: BackgroundTas
     try:
         # Get configuration
         if task_request.config_name:
-            config = config_manager.get_config(task_request.config_name)
+            config = thaw(config_manager.get_config(task_request.config_name))
         elif task_request.custom_config:
             config = task_request.custom_config
         else:
-            config = get_recommended_config(task_request.task_description)
+            config = thaw(get_recommended_config(task_request.task_description))
         
         # Enable VNC if requested
         if task_request.enable_vnc:
@@ -175,26 +199,9 @@ async def create_task(task_request: TaskRequest, background_tasks: BackgroundTas
         else:
             schema = get_schema_for_task(task_request.task_description)
         
-        # Create backend and task
-        backend = BrowserAutomationBackend(config)
-        
-        # Add streaming callback if enabled
-        if task_request.stream_output:
-            def stream_callback(step: TaskStep):
-                asyncio.create_task(manager.send_personal_message({
-                    "type": "step_update",
-                    "task_id": task_id,
-                    "step": {
-                        "step_id": step.step_id,
-                        "action": step.action,
-                        "timestamp": step.timestamp.isoformat(),
-                        "status": step.status.value,
-                        "details": step.details,
-                        "error": step.error
-                    }
-                }, task_id))
-            
-            backend.add_step_callback(stream_callback)
+        # Each request gets its own backend: pooled browsers keep their
+        # sessions, so they must never be shared between users' tasks
+        backend = create_backend(config)
         
         # Store task info
         active_tasks[task_id] = {
@@ -269,6 +276,7 @@ async def run_automation_task(task_id: str, backend: BrowserAutomationBackend, s
         # Cleanup
         if task_id in active_backends:
             del active_backends[task_id]
+        await backend.aclose()
 
 @app.get("/api/tasks/{task_id}")
 async def get_task_status(task_id: str):
@@ -338,7 +346,7 @@ async def generate_code(request: CodeGenerationRequest):
 @app.get("/api/supported-languages")
 async def get_supported_languages():
     """Get list of supported programming languages."""
-    return code_generator.get_supported_languages()
+    return thaw(code_generator.get_supported_languages())
 
 @app.get("/api/configs")
 async def list_configs():
@@ -437,7 +445,7 @@ async def stream_task_updates(task_id: str):
             task_info = active_tasks[task_id]
             
             # Send current status
-            yield f"data: {json.dumps(task_info, default=str)}\n\n"
+            yield f"data: {json.dumps(task_info, default=json_default)}\n\n"
             
             # Check if task is completed
             if task_info["status"] in ["completed", "failed", "cancelled"]: